@@ -7,6 +7,38 @@ class ConfigError(Exception):
     """Custom exception for configuration errors in Storyblok MCP"""
     pass
 
+# Management API requests per second allowed for each plan tier
+PLAN_RATE_LIMITS = {
+    "free": 3.0,
+    "paid": 6.0,
+}
+
+def _int_env(name: str, default: int) -> int:
+    """Reads a non-negative integer from the environment, raising ConfigError if it is malformed."""
+    raw = os.getenv(name)
+    if raw is None or raw == "":
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ConfigError(f"{name} must be an integer, got '{raw}'.")
+    if value < 0:
+        raise ConfigError(f"{name} must not be negative.")
+    return value
+
+def _float_env(name: str, default: float) -> float:
+    """Reads a positive float from the environment, raising ConfigError if it is malformed."""
+    raw = os.getenv(name)
+    if raw is None or raw == "":
+        return default
+    try:
+        value = float(raw)
+    except ValueError:
+        raise ConfigError(f"{name} must be a number, got '{raw}'.")
+    if value <= 0:
+        raise ConfigError(f"{name} must be greater than 0.")
+    return value
+
 class Config:
     """
     Loads and validates Storyblok configuration from environment variables.
@@ -15,6 +47,15 @@ class Config:
         space_id (str): Storyblok space ID.
         management_token (str): Storyblok management API token.
         public_token (str): Storyblok default public API token.
+        plan (str): Storyblok plan tier used to pick the default rate limit.
+        rate_limit (float): Management API requests per second per space.
+        rate_burst (float): Maximum number of requests that may be sent back to back.
+        max_retries (int): Retries for transient Management API failures (429/5xx).
+        retry_backoff (float): Base delay in seconds for exponential retry backoff.
+        bulk_concurrency (int): Default number of in-flight requests for bulk tools.
+        cache_max_bytes (int): Size bound of the in-process GET response cache (0 disables it).
+        cache_dir (str): Directory for indexes and caches persisted to local disk.
+        version_cache_max_bytes (int): Size bound of the on-disk cache of immutable versions (0 disables it).
     """
     def __init__(self):
         """Initializes Config and validates required environment variables."""
@@ -29,6 +70,21 @@ class Config:
         if not self.public_token:
             raise ConfigError("STORYBLOK_DEFAULT_PUBLIC_TOKEN is missing.")
 
+        self.plan = os.getenv("STORYBLOK_PLAN", "free").lower()
+        if self.plan not in PLAN_RATE_LIMITS:
+            raise ConfigError(
+                f"STORYBLOK_PLAN must be one of {', '.join(PLAN_RATE_LIMITS)}, got '{self.plan}'."
+            )
+        self.rate_limit = _float_env("STORYBLOK_RATE_LIMIT", PLAN_RATE_LIMITS[self.plan])
+        self.rate_burst = _float_env("STORYBLOK_RATE_BURST", max(1.0, self.rate_limit))
+        self.max_retries = _int_env("STORYBLOK_MAX_RETRIES", 3)
+        self.retry_backoff = _float_env("STORYBLOK_RETRY_BACKOFF", 0.5)
+        self.bulk_concurrency = max(1, _int_env("STORYBLOK_BULK_CONCURRENCY", 5))
+        self.cache_max_bytes = _int_env("STORYBLOK_CACHE_MAX_BYTES", 16 * 1024 * 1024)
+        self.cache_dir = os.getenv("STORYBLOK_CACHE_DIR") or os.path.join(os.getcwd(), ".storyblok_cache")
+        self.version_cache_max_bytes = _int_env("STORYBLOK_VERSION_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+
 API_ENDPOINTS = {
-    "MANAGEMENT": "https://mapi.storyblok.com/v1"
+    "MANAGEMENT": "https://mapi.storyblok.com/v1",
+    "DELIVERY": "https://api.storyblok.com/v2/cdn",
 }
@@ -32,11 +32,12 @@ from tools.approvals import register_approvals
 from tools.activities import register_activities
 from tools.extensions import register_extensions
 from tools.field_plugins import register_field_plugin_retrieval
-from httpx import AsyncClient
+from utils.api import create_client
 
 # Load and validate config (space ID, tokens)
 cfg = Config()
-client = AsyncClient() 
+# Shared client; Management API requests are paced by the scheduler in utils/api.py
+client = create_client()
 
 # Create MCP server instance with name/version
 mcp = FastMCP(name="storyblok-mcp-server", version="1.0.0")
@@ -61,6 +62,7 @@ all_tools_info = [
 
     # assets.py
     {"name": "fetch_assets", "description": "Fetch assets."},
+    {"name": "fetch_all_assets", "description": "Fetch all assets across every page."},
     {"name": "get_asset", "description": "Get an asset by ID."},
     {"name": "delete_asset", "description": "Delete an asset by ID."},
     {"name": "update_asset", "description": "Update an asset."},
@@ -69,6 +71,12 @@ all_tools_info = [
     {"name": "bulk_restore_assets", "description": "Bulk restore assets."},
     {"name": "init_asset_upload", "description": "Initialize asset upload."},
     {"name": "complete_asset_upload", "description": "Complete asset upload."},
+    {"name": "upload_asset_from_file", "description": "Upload a local file as an asset with checksum verification."},
+    {"name": "bulk_upload_assets_from_directory", "description": "Upload a local directory as assets, skipping duplicates."},
+    {"name": "refresh_asset_catalog", "description": "Sync the local asset catalog."},
+    {"name": "query_asset_catalog", "description": "Search assets in the local catalog by name, type, folder, tags, size."},
+    {"name": "find_unused_assets", "description": "Find (and optionally delete) assets no story refers to."},
+    {"name": "bulk_update_asset_metadata", "description": "Update metadata of many assets, merging with existing meta_data."},
 
     # assets_folder.py
     {"name": "retrieve_asset_folders", "description": "Retrieve asset folders."},
@@ -82,6 +90,7 @@ all_tools_info = [
 
     # collaborators.py
     {"name": "retrieve_multiple_collaborators", "description": "Retrieve multiple collaborators."},
+    {"name": "fetch_all_collaborators", "description": "Fetch all collaborators across every page."},
     {"name": "update_collaborator", "description": "Update a collaborator."},
     {"name": "delete_collaborator", "description": "Delete a collaborator."},
 
@@ -92,6 +101,8 @@ all_tools_info = [
     {"name": "update_component", "description": "Update a component."},
     {"name": "delete_component", "description": "Delete a component."},
     {"name": "get_component_usage", "description": "Get component usage."},
+    {"name": "build_component_usage_index", "description": "Build the persistent component usage index."},
+    {"name": "query_component_usage", "description": "Query component usage for one or many components."},
     {"name": "retrieve_component_versions", "description": "Retrieve component versions."},
     {"name": "retrieve_single_component_version", "description": "Retrieve a single component version."},
     {"name": "restore_component_version", "description": "Restore a component version."},
@@ -156,6 +167,9 @@ all_tools_info = [
 
     # ping.py
     {"name": "ping", "description": "Ping the server."},
+    {"name": "get_request_scheduler_stats", "description": "Get request scheduler queue depth and wait times."},
+    {"name": "get_response_cache_stats", "description": "Get response cache hits, misses and size."},
+    {"name": "clear_response_cache", "description": "Clear the response cache."},
 
     # pipelines.py
     {"name": "retrieve_multiple_branches", "description": "Retrieve multiple branches."},
@@ -203,6 +217,7 @@ all_tools_info = [
 
     # stories.py
     {"name": "fetch_stories", "description": "Fetch stories."},
+    {"name": "fetch_all_stories", "description": "Fetch all stories across every page."},
     {"name": "get_story", "description": "Get a story."},
     {"name": "create_story", "description": "Create a story."},
     {"name": "update_story", "description": "Update a story."},
@@ -210,16 +225,21 @@ all_tools_info = [
     {"name": "publish_story", "description": "Publish a story."},
     {"name": "unpublish_story", "description": "Unpublish a story."},
     {"name": "get_story_versions", "description": "Get story versions."},
+    {"name": "fetch_all_story_versions", "description": "Fetch all versions of a story."},
     {"name": "restore_story", "description": "Restore a story."},
     {"name": "validate_story_content", "description": "Validate story content."},
+    {"name": "validate_stories_batch", "description": "Validate all matching stories and report aggregated errors."},
     {"name": "debug_story_access", "description": "Debug story access."},
     {"name": "bulk_publish_stories", "description": "Bulk publish stories."},
+    {"name": "publish_stories_in_order", "description": "Publish stories or a release so linked stories go live first."},
     {"name": "bulk_delete_stories", "description": "Bulk delete stories."},
     {"name": "bulk_update_stories", "description": "Bulk update stories."},
     {"name": "bulk_create_stories", "description": "Bulk create stories."},
     {"name": "get_unpublished_dependencies", "description": "Get unpublished dependencies."},
     {"name": "ai_translate_story", "description": "AI translate story."},
     {"name": "compare_story_versions", "description": "Compare story versions."},
+    {"name": "diff_story_versions", "description": "Structural diff between two story versions."},
+    {"name": "diff_story_version_range", "description": "Diff each step across a range of story versions."},
 
     # tags.py
     {"name": "retrieve_multiple_tags", "description": "Retrieve multiple tags."},
@@ -230,6 +250,7 @@ all_tools_info = [
 
     # tasks.py
     {"name": "retrieve_multiple_tasks", "description": "Retrieve multiple tasks."},
+    {"name": "fetch_all_tasks", "description": "Fetch all tasks across every page."},
     {"name": "retrieve_single_task", "description": "Retrieve a single task."},
     {"name": "create_task", "description": "Create a task."},
     {"name": "update_task", "description": "Update a task."},
@@ -237,6 +258,7 @@ all_tools_info = [
 
     # webhooks.py
     {"name": "retrieve_multiple_webhooks", "description": "Retrieve multiple webhooks."},
+    {"name": "fetch_all_webhooks", "description": "Fetch all webhooks across every page."},
     {"name": "retrieve_single_webhook", "description": "Retrieve a single webhook."},
     {"name": "add_webhook", "description": "Add a webhook."},
     {"name": "update_webhook", "description": "Update a webhook."},
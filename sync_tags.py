@@ -1,7 +1,6 @@
 import asyncio
-import httpx
 from config import Config
-from utils.api import build_management_url, get_management_headers
+from utils.api import build_management_url, get_management_headers, create_client
 
 # List of tags to sync
 ALL_TAGS = [
@@ -16,7 +15,8 @@ async def sync_tags():
     url = build_management_url("/tags")
     existing_tags = set()
     
-    async with httpx.AsyncClient() as client:
+    # Shared client paces requests and retries 429s, so no manual sleeps are needed
+    async with create_client() as client:
         print("Fetching existing tags...")
         resp = await client.get(url, headers=headers)
         if resp.status_code == 200:
@@ -34,27 +34,15 @@ async def sync_tags():
             payload = {"tag": {"name": tag_name}}
             post_url = build_management_url("/tags/")
             
-            retries = 3
-            while retries > 0:
-                resp = await client.post(post_url, json=payload, headers=headers)
-                
-                if resp.status_code in [200, 201]:
-                    print(f"[{i+1}/{len(tags_to_add)}] Created: {tag_name}")
-                    break
-                elif resp.status_code == 422:
-                    # Already exists
-                    # print(f"[{i+1}/{len(tags_to_add)}] Exists: {tag_name}")
-                    break
-                elif resp.status_code == 429:
-                    print(f"Rate limited for {tag_name}. Waiting...")
-                    await asyncio.sleep(2) # Wait 2s
-                    retries -= 1
-                else:
-                    print(f"Error creating {tag_name}: {resp.status_code} {resp.text}")
-                    break
+            resp = await client.post(post_url, json=payload, headers=headers)
             
-            # Rate limiting or nice handling
-            await asyncio.sleep(0.25)
+            if resp.status_code in [200, 201]:
+                print(f"[{i+1}/{len(tags_to_add)}] Created: {tag_name}")
+            elif resp.status_code == 422:
+                # Already exists
+                pass
+            else:
+                print(f"Error creating {tag_name}: {resp.status_code} {resp.text}")
 
 if __name__ == "__main__":
     asyncio.run(sync_tags())
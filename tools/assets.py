@@ -1,5 +1,8 @@
+import asyncio
+import csv
 import json
-from typing import Optional, Dict, Any, Literal, List
+import os
+from typing import Optional, Dict, Any, Literal, List, Tuple
 from httpx import AsyncClient
 from mcp.server.fastmcp import FastMCP
 from utils.api import (
@@ -8,11 +11,87 @@ from utils.api import (
     _handle_response,
     create_pagination_params,
     add_optional_params,
+    paginate,
+    project_fields,
+    run_bounded,
+    summarize_bulk,
     APIError,
 )
+from utils.uploads import file_sha256, upload_file, upload_manifest
+from tools.assets_folder import ensure_asset_folders
+from utils.asset_catalog import asset_catalog, asset_path, extract_asset_references
 from datetime import datetime
+import httpx
 
 
+# Asset metadata stored in meta_data, also accepted as top-level record fields
+ASSET_META_FIELDS = ("alt", "title", "source", "copyright")
+
+# Asset settings a metadata record may change besides meta_data
+ASSET_CORE_FIELDS = ("asset_folder_id", "internal_tag_ids", "locked", "is_private", "focus")
+
+def _load_asset_records(file_path: str) -> List[Dict[str, Any]]:
+    """
+    Reads metadata records from a CSV (header row; `meta_data.<key>` columns go into
+    meta_data, empty cells are ignored, internal_tag_ids are comma or semicolon
+    separated) or NDJSON file (one JSON object per line).
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If a value cannot be parsed or an NDJSON line is not a JSON object.
+    """
+    with open(file_path, newline="", encoding="utf-8") as f:
+        if file_path.lower().endswith(".csv"):
+            records = []
+            for row in csv.DictReader(f):
+                record: Dict[str, Any] = {}
+                for column, value in row.items():
+                    if column is None or value in (None, ""):
+                        continue
+                    if column.startswith("meta_data."):
+                        record.setdefault("meta_data", {})[column[len("meta_data."):]] = value
+                    elif column == "asset_folder_id":
+                        record[column] = int(value)
+                    elif column == "internal_tag_ids":
+                        record[column] = [int(v) for v in value.replace(";", ",").split(",") if v.strip()]
+                    elif column in ("locked", "is_private"):
+                        record[column] = value.strip().lower() in ("1", "true", "yes")
+                    else:
+                        record[column] = value
+                records.append(record)
+            return records
+        records = []
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"Line {number} of {file_path} is not valid JSON: {e}") from e
+            if not isinstance(record, dict):
+                raise ValueError(f"Line {number} of {file_path} is not a JSON object.")
+            records.append(record)
+        return records
+
+def _merged_asset_update(asset: Dict[str, Any], record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Builds the update payload for one record, merging its metadata into the asset's
+    existing meta_data. Returns an empty dict if the record changes nothing.
+    """
+    payload: Dict[str, Any] = {
+        field: record[field] for field in ASSET_CORE_FIELDS
+        if record.get(field) is not None and record[field] != asset.get(field)
+    }
+    current = dict(asset.get("meta_data") or {})
+    for field in ASSET_META_FIELDS:
+        if field not in current and asset.get(field) not in (None, ""):
+            current[field] = asset[field]
+    updates = dict(record.get("meta_data") or {})
+    updates.update({field: record[field] for field in ASSET_META_FIELDS if record.get(field) is not None})
+    merged = {**current, **updates}
+    if merged != current:
+        payload["meta_data"] = merged
+    return payload
+
 def register_assets(mcp: FastMCP, client: AsyncClient) -> None:
 
     @mcp.tool()
@@ -53,6 +132,46 @@ def register_assets(mcp: FastMCP, client: AsyncClient) -> None:
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
 
+    @mcp.tool()
+    async def fetch_all_assets(
+        search: Optional[str] = None,
+        folder_id: Optional[int] = None,
+        sort_by: Optional[Literal[
+            "created_at:asc", "created_at:desc",
+            "updated_at:asc", "updated_at:desc",
+            "short_filename:asc", "short_filename:desc"
+        ]] = None,
+        is_private: Optional[bool] = None,
+        by_alt: Optional[str] = None,
+        by_title: Optional[str] = None,
+        by_copyright: Optional[str] = None,
+        with_tags: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        max_items: Optional[int] = None
+    ) -> Any:
+        """
+        Retrieve every asset matching the filters, following all pages.
+        """
+        try:
+            params: Dict[str, Any] = {}
+            add_optional_params(params, {
+                "search": search,
+                "in_folder": folder_id,
+                "sort_by": sort_by,
+                "is_private": "1" if is_private else None,
+                "by_alt": by_alt,
+                "by_title": by_title,
+                "by_copyright": by_copyright,
+                "with_tags": with_tags,
+            })
+            assets = [
+                project_fields(asset, fields)
+                async for asset in paginate(client, "/assets", "assets", params, max_items=max_items)
+            ]
+            return {"assets": assets, "total": len(assets)}
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
     @mcp.tool()
     async def get_asset(id: str) -> Any:
         """Gets a specific asset by ID."""
@@ -70,6 +189,7 @@ def register_assets(mcp: FastMCP, client: AsyncClient) -> None:
             url = build_management_url(f"/assets/{id}")
             resp = await client.delete(url, headers=get_management_headers())
             _handle_response(resp, url)
+            asset_catalog.remove([id])
             return {"content": [{"type": "text", "text": f"Asset {id} has been successfully deleted."}]}
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
@@ -141,7 +261,9 @@ def register_assets(mcp: FastMCP, client: AsyncClient) -> None:
             payload = {"ids": ids}
             url = build_management_url("/assets/bulk_destroy")
             resp = await client.post(url, json=payload, headers=get_management_headers())
-            return _handle_response(resp, url)
+            data = _handle_response(resp, url)
+            asset_catalog.remove(ids)
+            return data
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
     
@@ -212,3 +334,352 @@ def register_assets(mcp: FastMCP, client: AsyncClient) -> None:
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
 
+    @mcp.tool()
+    async def upload_asset_from_file(
+        file_path: str,
+        asset_folder_id: Optional[int] = None,
+        filename: Optional[str] = None,
+        content_type: Optional[str] = None
+    ) -> Any:
+        """
+        Uploads a local file as a new asset in one call: init_asset_upload, a signed
+        S3 upload streamed from disk in chunks, then complete_asset_upload.
+        The file's MD5 is computed while streaming and checked against the ETag S3
+        returns; on a mismatch or failed transfer the unfinished asset is deleted.
+        """
+        try:
+            return await upload_file(client, file_path, asset_folder_id, filename, content_type)
+        except (APIError, OSError, httpx.HTTPError) as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
+    @mcp.tool()
+    async def bulk_upload_assets_from_directory(
+        directory: str,
+        asset_folder_id: Optional[int] = None,
+        recursive: bool = True,
+        extensions: Optional[List[str]] = None,
+        concurrency: Optional[int] = None,
+        max_failures: Optional[int] = None,
+        dry_run: bool = False
+    ) -> Any:
+        """
+        Uploads every file of a local directory as assets into asset_folder_id.
+        With recursive, subdirectories are mirrored as asset folders, which are created
+        when missing. Files are hashed (SHA-256, streamed) and skipped as duplicates
+        when the same content was uploaded to the same folder before (local upload
+        manifest) or an asset with the same filename and size is already in the folder.
+        Top-level assets are looked up in the asset catalog; subfolders are listed.
+        Up to `concurrency` files are hashed and uploaded at once; once `max_failures`
+        uploads have failed, the remaining files are skipped. With dry_run, nothing is
+        created and the files that would be uploaded are reported.
+        Args:
+            directory (str): Local directory to upload.
+            asset_folder_id (Optional[int]): Target folder; None for the top level.
+            recursive (bool): Include subdirectories, mirrored as asset folders.
+            extensions (Optional[List[str]]): Only upload files with these extensions, e.g. [".jpg", ".png"].
+            concurrency (Optional[int]): Files processed at once.
+            max_failures (Optional[int]): Stop starting uploads after this many failures.
+            dry_run (bool): Only report what would be uploaded.
+        """
+        if not os.path.isdir(directory):
+            return {"isError": True, "content": [{"type": "text", "text": f"{directory} is not a directory"}]}
+        wanted = {e.lower() if e.startswith(".") else f".{e.lower()}" for e in extensions or []}
+
+        files: List[Tuple[str, Tuple[str, ...]]] = []
+        for root, dirs, names in os.walk(directory):
+            dirs.sort()
+            if not recursive:
+                dirs.clear()
+            rel = os.path.relpath(root, directory)
+            folder_path = () if rel == "." else tuple(rel.split(os.sep))
+            for name in sorted(names):
+                if name.startswith(".") or (wanted and os.path.splitext(name)[1].lower() not in wanted):
+                    continue
+                files.append((os.path.join(root, name), folder_path))
+
+        try:
+            folders = await ensure_asset_folders(
+                client, sorted({path for _, path in files}), asset_folder_id, create=not dry_run
+            )
+
+            def entry(asset: Dict[str, Any]) -> Tuple[Any, Any, Any]:
+                return asset.get("short_filename"), asset.get("content_length"), asset.get("id")
+
+            async def existing_in(folder_id: Optional[int]) -> set:
+                if folder_id is None:
+                    # The listing can't filter on the top level, so use the catalog's folder index
+                    await asset_catalog.ensure_fresh(client)
+                    return {entry(asset_catalog.assets[i]) for i in asset_catalog.by_folder.get(None, ())}
+                return {
+                    entry(asset)
+                    async for asset in paginate(client, "/assets", "assets", {"in_folder": folder_id})
+                    if asset.get("asset_folder_id") == folder_id
+                }
+
+            folder_ids = list(dict.fromkeys(folders.values()))
+            listings = await asyncio.gather(*(existing_in(fid) for fid in folder_ids))
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+        existing_ids = {fid: {entry[2] for entry in listing} for fid, listing in zip(folder_ids, listings)}
+        existing_names = {fid: {entry[:2]: entry[2] for entry in listing} for fid, listing in zip(folder_ids, listings)}
+
+        claimed: Dict[Tuple[str, Tuple[str, ...]], str] = {}
+
+        async def upload(item: Tuple[str, Tuple[str, ...]]) -> Dict[str, Any]:
+            path, folder_path = item
+            result: Dict[str, Any] = {"path": path, "folder": "/".join(folder_path)}
+            try:
+                sha256 = await asyncio.to_thread(file_sha256, path)
+                size = os.path.getsize(path)
+            except OSError as e:
+                return {**result, "status": "error", "error": str(e)}
+            result["sha256"] = sha256
+            # A folder missing from `folders` does not exist yet (dry run), so it holds no duplicates
+            folder_id = folders.get(folder_path)
+            if folder_path in folders:
+                recorded = upload_manifest.lookup(sha256, folder_id)
+                if recorded and recorded["id"] in existing_ids[folder_id]:
+                    return {**result, "status": "duplicate", "asset_id": recorded["id"], "matched_by": "sha256"}
+                known = existing_names[folder_id].get((os.path.basename(path), size))
+                if known is not None:
+                    return {**result, "status": "duplicate", "asset_id": known, "matched_by": "filename_and_size"}
+            key = (sha256, folder_path)
+            if key in claimed:
+                return {**result, "status": "duplicate", "duplicate_of": claimed[key], "matched_by": "sha256"}
+            claimed[key] = path
+            if dry_run:
+                return {**result, "status": "pending", "size": size}
+            try:
+                uploaded = await upload_file(client, path, folder_id)
+                upload_manifest.record(sha256, folder_id, uploaded["id"], uploaded["filename"])
+                # Keeps top-level duplicate checks right before the catalog's next sync
+                asset_catalog.add({
+                    "filename": uploaded["filename"], **(uploaded["asset"] or {}), "id": uploaded["id"],
+                    "short_filename": uploaded["filename"], "content_length": size, "asset_folder_id": folder_id,
+                })
+                return {**result, "status": "success", "asset_id": uploaded["id"], "checksum": uploaded["checksum"]}
+            except (APIError, OSError, httpx.HTTPError) as e:
+                return {**result, "status": "error", "error": str(e)}
+
+        try:
+            results = await run_bounded(
+                files, upload, concurrency, max_failures,
+                on_skip=lambda item: {"path": item[0], "folder": "/".join(item[1]), "status": "skipped"}
+            )
+        finally:
+            upload_manifest.save()
+
+        summary = summarize_bulk(results)
+        summary["duplicate_files"] = sum(1 for r in results if r["status"] == "duplicate")
+        summary["folders"] = {"/".join(path) or ".": fid for path, fid in folders.items()}
+        if dry_run:
+            summary["dry_run"] = True
+            summary["pending_uploads"] = sum(1 for r in results if r["status"] == "pending")
+        return summary
+
+    @mcp.tool()
+    async def refresh_asset_catalog(full: bool = False) -> Any:
+        """
+        Updates the local asset catalog used by query_asset_catalog. By default only
+        assets changed since the last sync are fetched; full rebuilds it from a crawl
+        of every asset, which also drops assets deleted outside this server.
+        """
+        try:
+            result = await asset_catalog.refresh(client, full)
+            return {**result, **asset_catalog.stats()}
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
+    @mcp.tool()
+    async def query_asset_catalog(
+        filename: Optional[str] = None,
+        extensions: Optional[List[str]] = None,
+        folder_id: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+        text: Optional[str] = None,
+        min_width: Optional[int] = None,
+        max_width: Optional[int] = None,
+        min_height: Optional[int] = None,
+        max_height: Optional[int] = None,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        limit: int = 50,
+        offset: int = 0,
+        fields: Optional[List[str]] = None
+    ) -> Any:
+        """
+        Searches the local asset catalog without paging through the API.
+        Filters combine: filename substring, extensions, folder (0 for the top level),
+        tags (all required), text in alt/title/copyright, pixel dimensions and size
+        in bytes. The catalog is built on first use and synced with the latest
+        changes when it is more than five minutes old.
+        """
+        try:
+            await asset_catalog.ensure_fresh(client)
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+        matches = asset_catalog.query(
+            filename, extensions, folder_id, tags, text,
+            min_width, max_width, min_height, max_height, min_size, max_size
+        )
+        return {
+            "total": len(matches),
+            "offset": offset,
+            "assets": [project_fields(asset, fields) for asset in matches[offset:offset + limit]],
+            "synced_at": asset_catalog.synced_at,
+        }
+
+    @mcp.tool()
+    async def find_unused_assets(
+        folder_id: Optional[int] = None,
+        min_size: Optional[int] = None,
+        limit: int = 100,
+        delete: bool = False,
+        chunk_size: int = 100,
+        concurrency: Optional[int] = None
+    ) -> Any:
+        """
+        Finds assets that no story refers to. The content of every story is streamed in
+        one pass over the story listing, which returns the draft, and every asset
+        reference is collected: asset and multiasset fields, rich text images and
+        asset URLs in any text. These are
+        joined against the asset catalog (synced first). Assets used only outside
+        story content, e.g. in component presets or datasources, are reported too,
+        so review the list before deleting.
+        With delete, the catalog is rebuilt from a full crawl first, so assets already
+        deleted elsewhere are not sent again, and the unused assets are removed with
+        delete_multiple_assets in chunks of `chunk_size`; by default nothing is deleted.
+        Nothing is deleted if any story was listed without its content.
+        Args:
+            folder_id (Optional[int]): Only consider assets in this folder (0 for the top level).
+            min_size (Optional[int]): Only consider assets of at least this many bytes.
+            limit (int): Maximum unused assets listed in the response.
+            delete (bool): Delete the unused assets.
+            chunk_size (int): Assets per bulk delete request.
+            concurrency (Optional[int]): Bulk delete requests in flight at once.
+        """
+        used_ids: set = set()
+        used_paths: set = set()
+        scanned: set = set()
+        without_content: set = set()
+
+        async def scan() -> None:
+            # The Management API listing ignores `version`, so one crawl covers every story
+            params = {"with_content": 1, "story_only": 1}
+            async for story in paginate(client, "/stories", "stories", params):
+                scanned.add(story["id"])
+                if not isinstance(story.get("content"), dict):
+                    without_content.add(story["id"])
+                ids, paths = extract_asset_references(story.get("content"))
+                used_ids.update(ids)
+                used_paths.update(paths)
+
+        try:
+            # Delta syncs can't see deletions, so only a full crawl is trusted for deleting
+            await asyncio.gather(scan(), asset_catalog.refresh(client, full=delete))
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
+        candidates = asset_catalog.query(folder_id=folder_id, min_size=min_size)
+        unused = [
+            asset for asset in candidates
+            if asset["id"] not in used_ids and asset_path(asset.get("filename") or "") not in used_paths
+        ]
+        unused.sort(key=lambda asset: asset.get("content_length") or 0, reverse=True)
+        report: Dict[str, Any] = {
+            "stories_scanned": len(scanned),
+            "stories_without_content": sorted(without_content),
+            "assets_checked": len(candidates),
+            "unused_count": len(unused),
+            "unused_bytes": sum(asset.get("content_length") or 0 for asset in unused),
+            "unused_assets": [
+                project_fields(asset, ["id", "filename", "short_filename", "content_length", "asset_folder_id", "updated_at"])
+                for asset in unused[:limit]
+            ],
+        }
+        if not delete or not unused:
+            report["deleted"] = False
+            return report
+        if without_content:
+            # Their references are unknown, so any asset could still be in use
+            report["deleted"] = False
+            report["delete_error"] = (
+                f"{len(without_content)} stories were listed without content; nothing was deleted."
+            )
+            return report
+
+        ids = [asset["id"] for asset in unused]
+        chunk_size = max(1, chunk_size)
+
+        async def destroy(chunk: List[int]) -> Dict[str, Any]:
+            try:
+                url = build_management_url("/assets/bulk_destroy")
+                resp = await client.post(url, json={"ids": chunk}, headers=get_management_headers())
+                _handle_response(resp, url)
+                asset_catalog.remove(chunk)
+                return {"ids": chunk, "status": "success"}
+            except APIError as e:
+                return {"ids": chunk, "status": "error", "error": str(e)}
+
+        results = await run_bounded([ids[i:i + chunk_size] for i in range(0, len(ids), chunk_size)], destroy, concurrency)
+        report["deleted"] = True
+        report["deleted_count"] = sum(len(r["ids"]) for r in results if r["status"] == "success")
+        report["delete_errors"] = [r for r in results if r["status"] == "error"]
+        return report
+
+    @mcp.tool()
+    async def bulk_update_asset_metadata(
+        records: Optional[List[Dict[str, Any]]] = None,
+        file_path: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        max_failures: Optional[int] = None,
+        dry_run: bool = False
+    ) -> Any:
+        """
+        Updates metadata of many assets. Each record names its asset with `asset_id`
+        (or `id`) and may set alt, title, source, copyright, meta_data and the asset
+        settings asset_folder_id, internal_tag_ids, locked, is_private and focus.
+        Records come from `records` or a CSV/NDJSON file at `file_path`.
+        Every asset is fetched first and the record is merged into its existing
+        meta_data, so fields not in the record are kept; assets the record would not
+        change are reported as "unchanged" and not updated. Up to `concurrency`
+        assets are processed at once; once `max_failures` have failed, the remaining
+        records are skipped. With dry_run, the merged payloads are returned instead.
+        """
+        if file_path:
+            try:
+                records = _load_asset_records(file_path)
+            except (OSError, ValueError) as e:
+                return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+        if not records:
+            return {"isError": True, "content": [{"type": "text", "text": "Provide records or file_path."}]}
+
+        async def update(record: Dict[str, Any]) -> Dict[str, Any]:
+            asset_id = record.get("asset_id", record.get("id"))
+            if asset_id in (None, ""):
+                return {"asset_id": None, "status": "error", "error": "Record has no asset_id."}
+            try:
+                url = build_management_url(f"/assets/{asset_id}")
+                resp = await client.get(url, headers=get_management_headers())
+                asset = _handle_response(resp, url)
+                asset = asset.get("asset", asset)
+                payload = _merged_asset_update(asset, record)
+                if not payload:
+                    return {"asset_id": asset_id, "status": "unchanged"}
+                if dry_run:
+                    return {"asset_id": asset_id, "status": "pending", "payload": payload}
+                resp = await client.put(url, json=payload, headers=get_management_headers())
+                _handle_response(resp, url)
+                return {"asset_id": asset_id, "status": "success", "updated_fields": sorted(payload)}
+            except APIError as e:
+                return {"asset_id": asset_id, "status": "error", "error": str(e)}
+
+        results = await run_bounded(
+            records, update, concurrency, max_failures,
+            on_skip=lambda record: {"asset_id": record.get("asset_id", record.get("id")), "status": "skipped"}
+        )
+        summary = summarize_bulk(results)
+        summary["unchanged_operations"] = sum(1 for r in results if r["status"] == "unchanged")
+        if dry_run:
+            summary["dry_run"] = True
+        return summary
@@ -1,5 +1,5 @@
 import json
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from httpx import AsyncClient
 from mcp.server.fastmcp import FastMCP
 from utils.api import (
@@ -9,6 +9,48 @@ from utils.api import (
     APIError,
 )
 
+async def ensure_asset_folders(
+    client: AsyncClient,
+    paths: List[Tuple[str, ...]],
+    root_id: Optional[int] = None,
+    create: bool = True
+) -> Dict[Tuple[str, ...], Optional[int]]:
+    """
+    Resolves nested folder paths (tuples of folder names below root_id) to folder ids,
+    creating the folders that do not exist yet, parents first.
+    Args:
+        client (AsyncClient): Shared client.
+        paths (List[Tuple[str, ...]]): Folder paths relative to root_id; () is root_id itself.
+        root_id (Optional[int]): Folder the paths start from; None for the top level.
+        create (bool): Create missing folders. When False they are left out of the result.
+    Returns:
+        Dict[Tuple[str, ...], Optional[int]]: Path -> folder id.
+    Raises:
+        APIError: If listing or creating a folder fails.
+    """
+    url = build_management_url("/asset_folders/")
+    resp = await client.get(url, headers=get_management_headers())
+    existing = {
+        (folder.get("parent_id") or None, folder.get("name")): folder["id"]
+        for folder in _handle_response(resp, url).get("asset_folders", [])
+    }
+    resolved: Dict[Tuple[str, ...], Optional[int]] = {(): root_id}
+    prefixes = {path[:i] for path in paths for i in range(1, len(path) + 1)}
+    for path in sorted(prefixes, key=len):
+        if path[:-1] not in resolved:
+            continue
+        key = (resolved[path[:-1]], path[-1])
+        if key not in existing:
+            if not create:
+                continue
+            payload: Dict[str, Any] = {"asset_folder": {"name": path[-1]}}
+            if key[0] is not None:
+                payload["asset_folder"]["parent_id"] = key[0]
+            resp = await client.post(url, headers=get_management_headers(), content=json.dumps(payload))
+            existing[key] = _handle_response(resp, url)["asset_folder"]["id"]
+        resolved[path] = existing[key]
+    return resolved
+
 
 def register_assets_folder(mcp: FastMCP, client: AsyncClient) -> None:
 
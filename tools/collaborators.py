@@ -6,6 +6,8 @@ from utils.api import (
     build_management_url,
     get_management_headers,
     _handle_response,
+    paginate,
+    project_fields,
     APIError,
 )
 
@@ -30,6 +32,24 @@ def register_collaborators(mcp: FastMCP, client: AsyncClient) -> None:
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
 
+    @mcp.tool()
+    async def fetch_all_collaborators(
+        fields: Optional[List[str]] = None,
+        max_items: Optional[int] = None
+    ) -> Any:
+        """
+        Retrieves all collaborators in the space by following every page of the list endpoint.
+        Use `fields` to keep only selected keys of each item.
+        """
+        try:
+            items = [
+                project_fields(item, fields)
+                async for item in paginate(client, "/collaborators/", "collaborators", max_items=max_items)
+            ]
+            return {"collaborators": items, "total": len(items)}
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
     @ mcp.tool()
     async def add_collaborator(
         email: str,
@@ -1,5 +1,6 @@
+import asyncio
 import json
-import requests
+import time
 from typing import Optional, Dict, Any, List
 from mcp.server.fastmcp import FastMCP
 from httpx import AsyncClient
@@ -8,8 +9,212 @@ from utils.api import (
     build_management_url,
     get_management_headers,
     _handle_response,
+    paginate,
     APIError,
 )
+from utils.usage_index import usage_index
+from utils.version_cache import version_cache
+
+def content_uses_component(content: Any, component_name: str) -> bool:
+    """
+    Return True if any blok in a content tree has the given component name.
+    Walks the tree iteratively so deeply nested content cannot hit the recursion limit.
+    """
+    stack = [content]
+    while stack:
+        val = stack.pop()
+        if isinstance(val, dict):
+            if val.get("component") == component_name:
+                return True
+            stack.extend(val.values())
+        elif isinstance(val, list):
+            stack.extend(val)
+    return False
+
+class ComponentSchemaRegistry:
+    """
+    Async, in-memory index of the space's components by name, id and uuid.
+    The full component list is loaded once; afterwards only components whose
+    `updated_at` changed are re-indexed on refresh, and the component tools
+    push their own writes into the registry directly.
+    """
+    def __init__(self, refresh_interval: float = 300):
+        """
+        Initialize ComponentSchemaRegistry.
+        Args:
+            refresh_interval (float): Seconds before the list is checked for changes again.
+        """
+        self.refresh_interval = refresh_interval
+        self.by_name: Dict[str, Dict[str, Any]] = {}
+        self.by_id: Dict[int, Dict[str, Any]] = {}
+        self.by_uuid: Dict[str, Dict[str, Any]] = {}
+        self.loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def upsert(self, component: Dict[str, Any]) -> None:
+        """Add or replace a component in every index."""
+        old = self.by_id.get(component.get("id"))
+        if old is not None:
+            self._unindex(old)
+        if component.get("name") is not None:
+            self.by_name[component["name"]] = component
+        if component.get("id") is not None:
+            self.by_id[component["id"]] = component
+        if component.get("uuid") is not None:
+            self.by_uuid[component["uuid"]] = component
+
+    def remove(self, component_id: Any) -> None:
+        """Drop a component by ID (int or numeric string)."""
+        try:
+            component = self.by_id.get(int(component_id))
+        except (TypeError, ValueError):
+            return
+        if component is not None:
+            self._unindex(component)
+
+    def _unindex(self, component: Dict[str, Any]) -> None:
+        self.by_name.pop(component.get("name"), None)
+        self.by_id.pop(component.get("id"), None)
+        self.by_uuid.pop(component.get("uuid"), None)
+
+    def invalidate(self) -> None:
+        """Force the next lookup to check the API for changes."""
+        self.loaded_at = None
+
+    async def refresh(self, client: AsyncClient) -> None:
+        """
+        Fetch the component list and re-index only what changed since the last load.
+        Raises:
+            APIError: If the components request fails.
+        """
+        url = build_management_url("/components")
+        resp = await client.get(url, headers=get_management_headers())
+        components = _handle_response(resp, url).get("components", [])
+
+        seen = set()
+        for comp in components:
+            seen.add(comp.get("id"))
+            current = self.by_id.get(comp.get("id"))
+            if current is None or current.get("updated_at") != comp.get("updated_at") or current.get("name") != comp.get("name"):
+                self.upsert(comp)
+        for stale_id in [cid for cid in self.by_id if cid not in seen]:
+            self._unindex(self.by_id[stale_id])
+        self.loaded_at = time.monotonic()
+
+    async def ensure_loaded(self, client: AsyncClient) -> None:
+        """Load or refresh the registry if it is empty or older than refresh_interval."""
+        if self.loaded_at is not None and time.monotonic() - self.loaded_at < self.refresh_interval:
+            return
+        async with self._lock:
+            # Another caller may have refreshed while we waited for the lock
+            if self.loaded_at is None or time.monotonic() - self.loaded_at >= self.refresh_interval:
+                await self.refresh(client)
+
+    async def get(self, client: AsyncClient, key: Any) -> Optional[Dict[str, Any]]:
+        """
+        Look a component up by name, id or uuid.
+        Args:
+            client (AsyncClient): Shared HTTP client, used if the registry needs loading.
+            key (Any): Component name, numeric id or uuid.
+        Returns:
+            Optional[Dict[str, Any]]: The component, or None if it does not exist.
+        """
+        await self.ensure_loaded(client)
+        if isinstance(key, int) or (isinstance(key, str) and key.isdigit()):
+            found = self.by_id.get(int(key))
+            if found is not None:
+                return found
+        return self.by_name.get(key) or self.by_uuid.get(key)
+
+schema_registry = ComponentSchemaRegistry()
+
+class ComponentGroupTree:
+    """
+    Cached component groups (folders) indexed by uuid, with parent/child links.
+    The component folder tools update it on every successful write.
+    """
+    def __init__(self, refresh_interval: float = 300):
+        """
+        Initialize ComponentGroupTree.
+        Args:
+            refresh_interval (float): Seconds before the groups are fetched again.
+        """
+        self.refresh_interval = refresh_interval
+        self.by_uuid: Dict[str, Dict[str, Any]] = {}
+        self.children: Dict[Optional[str], List[str]] = {}
+        self.loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def _rebuild_links(self) -> None:
+        self.children = {}
+        for uuid, group in self.by_uuid.items():
+            self.children.setdefault(group.get("parent_uuid"), []).append(uuid)
+
+    def load(self, groups: List[Dict[str, Any]]) -> None:
+        """Replace the tree with a freshly fetched group list."""
+        self.by_uuid = {g["uuid"]: g for g in groups if g.get("uuid")}
+        self._rebuild_links()
+        self.loaded_at = time.monotonic()
+
+    def upsert(self, group: Dict[str, Any]) -> None:
+        """Add or replace one group, e.g. from a create/update response."""
+        if self.loaded_at is None or not group.get("uuid"):
+            self.invalidate()
+            return
+        self.by_uuid[group["uuid"]] = group
+        self._rebuild_links()
+
+    def invalidate(self) -> None:
+        """Force the next read to fetch groups from the API."""
+        self.loaded_at = None
+
+    async def ensure_loaded(self, client: AsyncClient) -> None:
+        """
+        Fetch the groups if the tree is empty or older than refresh_interval.
+        Raises:
+            APIError: If the component_groups request fails.
+        """
+        if self.loaded_at is not None and time.monotonic() - self.loaded_at < self.refresh_interval:
+            return
+        async with self._lock:
+            if self.loaded_at is None or time.monotonic() - self.loaded_at >= self.refresh_interval:
+                url = build_management_url("/component_groups")
+                resp = await client.get(url, headers=get_management_headers())
+                self.load(_handle_response(resp, url).get("component_groups", []))
+
+    def groups(self) -> List[Dict[str, Any]]:
+        """Return every group as a flat list, like the API does."""
+        return list(self.by_uuid.values())
+
+    def nested(self, parent_uuid: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return the groups below parent_uuid as a nested tree with `children` lists."""
+        return [
+            {**self.by_uuid[uuid], "children": self.nested(uuid)}
+            for uuid in self.children.get(parent_uuid, [])
+        ]
+
+group_tree = ComponentGroupTree()
+
+async def get_component_schema_by_name(
+    client: AsyncClient,
+    component_name: str,
+    space_id: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Returns the schema of a component by its name, using the shared schema registry.
+
+    Args:
+        client (AsyncClient): Shared HTTP client.
+        component_name (str): The name of the component to retrieve.
+        space_id (Optional[str]): Placeholder for future use (e.g., handling different spaces or credentials).
+
+    Returns:
+        Optional[Dict[str, Any]]: The schema of the component if found, otherwise None.
+    """
+    component = await schema_registry.get(client, component_name)
+    if component is None:
+        return None
+    return component.get("schema") or None
 
 def register_components(mcp: FastMCP, client: AsyncClient) -> None:
     """
@@ -52,8 +257,15 @@ def register_components(mcp: FastMCP, client: AsyncClient) -> None:
         in_group: Optional[int] = None,
         sort_by: Optional[str] = None,
         per_page: Optional[int] = None,  # not used since non-paginated
+        include_groups: Optional[bool] = None,
+        groups_as_tree: bool = False,
     ) -> Dict[str, Any]:
-        """Fetches components with server-side filters, sorting, and option to include groups."""
+        """
+        Fetches components with server-side filters, sorting, and option to include groups.
+        Groups come from a cached folder tree and are fetched concurrently with the
+        components; they are left out by default when component_summary is set.
+        Set groups_as_tree to nest subfolders under their parents.
+        """
         try:
             url = build_management_url("/components")
             params = {}
@@ -68,8 +280,17 @@ def register_components(mcp: FastMCP, client: AsyncClient) -> None:
             if per_page:
                 params["per_page"] = per_page
 
-            resp = await client.get(url, headers=get_management_headers(), params=params)
-            data = _handle_response(resp, url)
+            if include_groups is None:
+                include_groups = not component_summary
+
+            async def fetch_list() -> Dict[str, Any]:
+                resp = await client.get(url, headers=get_management_headers(), params=params)
+                return _handle_response(resp, url)
+
+            if include_groups:
+                data, _ = await asyncio.gather(fetch_list(), group_tree.ensure_loaded(client))
+            else:
+                data = await fetch_list()
             components = data.get("components", [])
             
             # Summaries or remove schema if requested
@@ -81,17 +302,13 @@ def register_components(mcp: FastMCP, client: AsyncClient) -> None:
             elif not include_schema_details:
                 components = [{k: v for k, v in c.items() if k != "schema"} for c in components]
 
-            # Also fetch component groups (folders)
-            # API returns component_groups at /component_groups endpoint
-            groups_url = build_management_url("/component_groups")
-            grp_resp = await client.get(groups_url, headers=get_management_headers(), params={})
-            groups_data = _handle_response(grp_resp, groups_url).get("component_groups", [])
-
-            return {
+            result: Dict[str, Any] = {
                 "components_count": len(components),
                 "components": components,
-                "component_groups": groups_data
             }
+            if include_groups:
+                result["component_groups"] = group_tree.nested() if groups_as_tree else group_tree.groups()
+            return result
 
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
@@ -174,7 +391,10 @@ def register_components(mcp: FastMCP, client: AsyncClient) -> None:
                 headers=get_management_headers(),
                 content=json.dumps({"component": payload_comp})
             )
-            return _handle_response(resp, url)
+            data = _handle_response(resp, url)
+            if isinstance(data, dict) and data.get("component"):
+                schema_registry.upsert(data["component"])
+            return data
 
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
@@ -250,7 +470,12 @@ def register_components(mcp: FastMCP, client: AsyncClient) -> None:
                 headers=get_management_headers(),
                 content=json.dumps({"component": comp_data})
             )
-            return _handle_response(resp, url)
+            data = _handle_response(resp, url)
+            if isinstance(data, dict) and data.get("component"):
+                schema_registry.upsert(data["component"])
+            else:
+                schema_registry.invalidate()
+            return data
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
 
@@ -262,61 +487,80 @@ def register_components(mcp: FastMCP, client: AsyncClient) -> None:
             url = build_management_url(f"/components/{id}")
             resp = await client.delete(url, headers=get_management_headers())
             _handle_response(resp, url)
+            schema_registry.remove(id)
             return {"message": f"Component {id} has been successfully deleted."}
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
 
     @mcp.tool()
     async def get_component_usage(component_name: str) -> Dict[str, Any]:
-        """Finds stories where a component is used in content (draft & published)."""
-        MAX_PAGES = 10
-        PER_PAGE = 100
-        stories_map: Dict[int, Dict[str, Any]] = {}
-        limit_reached = False
-
-        async def fetch_page(version: str, page: int):
-            url = (build_management_url("/stories")
-                   + f"?page={page}&per_page={PER_PAGE}&with_content=1&version={version}")
-            resp = await client.get(url, headers=get_management_headers())
-            return _handle_response(resp, url)
+        """
+        Finds stories where a component is used in content (draft & published).
+        Candidates are narrowed server-side with `contain_component`; pages are
+        fetched concurrently and each story is checked as it arrives, so only
+        matches are kept in memory.
+        """
+        used: List[Dict[str, Any]] = []
+        seen: set = set()
+        matched: set = set()
+
+        async def scan(version: str) -> None:
+            params = {"contain_component": component_name, "with_content": 1, "version": version}
+            async for st in paginate(client, "/stories", "stories", params):
+                seen.add(st["id"])
+                # The other version of a story may still use the component, so only
+                # stories already matched are skipped
+                if st["id"] in matched:
+                    continue
+                # Without content in the listing, trust the server-side filter
+                if "content" not in st or content_uses_component(st.get("content"), component_name):
+                    matched.add(st["id"])
+                    used.append({k: st.get(k) for k in ("id", "name", "slug", "full_slug")})
 
-        for version in ("published", "draft"):
-            page = 1
-            while page <= MAX_PAGES:
-                try:
-                    data = await fetch_page(version, page)
-                    for st in data.get("stories", []):
-                        stories_map[st["id"]] = st
-                    if len(data.get("stories", [])) < PER_PAGE:
-                        break
-                    page += 1
-                except APIError:
-                    break
-            else:
-                limit_reached = True
-
-        used = []
-        def search(val: Any) -> bool:
-            if isinstance(val, list):
-                return any(search(v) for v in val)
-            if isinstance(val, dict):
-                if val.get("component") == component_name:
-                    return True
-                return any(search(v) for v in val.values())
-            return False
-
-        for st in stories_map.values():
-            if search(st.get("content", {})):
-                used.append({k: st[k] for k in ("id", "name", "slug", "full_slug")})
+        try:
+            await asyncio.gather(scan("published"), scan("draft"))
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
 
         return {
             "component_name": component_name,
             "usage_count": len(used),
-            "stories_analyzed_count": len(stories_map),
-            "search_limit_reached": limit_reached,
+            "stories_analyzed_count": len(seen),
             "used_in_stories": used
         }
     
+    @mcp.tool()
+    async def build_component_usage_index() -> Dict[str, Any]:
+        """
+        Crawls every story once and (re)builds the persistent component usage index.
+        The index is then kept up to date by the story create/update/delete tools.
+        """
+        try:
+            await usage_index.build(client)
+            return {
+                "stories_indexed": len(usage_index.stories),
+                "components_indexed": len(usage_index.components),
+                "index_built_at": usage_index.built_at
+            }
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
+    @mcp.tool()
+    async def query_component_usage(
+        component_names: List[str],
+        include_paths: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Looks up which stories use each of the given components, with counts and
+        field paths, from the local usage index. Builds the index on first use.
+        """
+        try:
+            if not usage_index.is_built:
+                await usage_index.build(client)
+            return usage_index.query(component_names, include_paths)
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
     @mcp.tool()
     async def retrieve_component_versions(
         component_id: str,
@@ -359,8 +603,13 @@ def register_components(mcp: FastMCP, client: AsyncClient) -> None:
     ) -> Dict[str, Any]:
         """
         Retrieves the schema details of a specific component version.
+        Versions are immutable and served from the local version cache after the first fetch.
         """
         try:
+            key = f"component_version:{component_id}:{version_id}"
+            cached = version_cache.get(key)
+            if cached is not None:
+                return cached
             url = build_management_url(
                 f"/components/{component_id}/component_versions/{version_id}"
             )
@@ -368,7 +617,9 @@ def register_components(mcp: FastMCP, client: AsyncClient) -> None:
                 url,
                 headers=get_management_headers()
             )
-            return _handle_response(resp, url)
+            data = _handle_response(resp, url)
+            version_cache.put(key, data)
+            return data
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
 
@@ -394,37 +645,10 @@ def register_components(mcp: FastMCP, client: AsyncClient) -> None:
                 headers=get_management_headers(),
                 content=json.dumps(payload)
             )
-            return _handle_response(resp, url)
+            data = _handle_response(resp, url)
+            # The restored schema is not part of the response, so re-check on next lookup
+            schema_registry.invalidate()
+            return data
 
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
-
-
-
-def get_component_schema_by_name(component_name: str, space_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
-    """
-    Fetches the schema of a component by its name from the Storyblok Management API.
-
-    Args:
-        component_name (str): The name of the component to retrieve.
-        space_id (Optional[str]): Placeholder for future use (e.g., handling different spaces or credentials).
-
-    Returns:
-        Optional[Dict[str, Any]]: The schema of the component if found, otherwise None.
-    """
-
-    # Future support for space-specific logic
-    if space_id:
-        # Placeholder for handling alternate tokens or clients per space
-        pass
-
-    endpoint = build_management_url('/components')
-    response = requests.get(endpoint, headers=get_management_headers())
-    data = _handle_response(response, endpoint)
-
-    if data and isinstance(data.get("components"), list):
-        for component in data["components"]:
-            if component.get("name") == component_name:
-                return component.get("schema") or None
-
-    return None
\ No newline at end of file
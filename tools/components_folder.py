@@ -1,5 +1,4 @@
 import json
-import requests
 from typing import Optional, Dict, Any, List
 from mcp.server.fastmcp import FastMCP
 from httpx import AsyncClient
@@ -10,6 +9,7 @@ from utils.api import (
     _handle_response,
     APIError,
 )
+from tools.components import group_tree
 
 def register_components_folder(mcp: FastMCP, client: AsyncClient) -> None:
     @mcp.tool()
@@ -34,7 +34,9 @@ def register_components_folder(mcp: FastMCP, client: AsyncClient) -> None:
                 headers=get_management_headers(),
                 content=json.dumps(payload),
             )
-            return _handle_response(resp, url)
+            data = _handle_response(resp, url)
+            group_tree.upsert(data.get("component_group") or {})
+            return data
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
 
@@ -65,7 +67,9 @@ def register_components_folder(mcp: FastMCP, client: AsyncClient) -> None:
                 headers=get_management_headers(),
                 content=json.dumps(payload)
             )
-            return _handle_response(resp, url)
+            data = _handle_response(resp, url)
+            group_tree.upsert(data.get("component_group") or {})
+            return data
 
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
@@ -87,6 +91,8 @@ def register_components_folder(mcp: FastMCP, client: AsyncClient) -> None:
                 headers=get_management_headers(),
             )
             _handle_response(resp, url)  # Expecting 200 OK or 204 No Content
+            # Subfolders and components may be re-parented, so re-fetch the tree
+            group_tree.invalidate()
 
             return {"message": f"Component folder {folder_id} deleted successfully."}
         except APIError as e:
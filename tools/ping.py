@@ -1,6 +1,8 @@
 from mcp.server.fastmcp import FastMCP
 from httpx import AsyncClient, HTTPStatusError
 from config import Config, API_ENDPOINTS
+from utils.api import scheduler, response_cache, NO_RETRY
+from utils.version_cache import version_cache
 
 cfg = Config()
 
@@ -13,7 +15,8 @@ def register_ping(mcp: FastMCP, client: AsyncClient) -> None:
         """
         try:
             url = f"https://mapi.storyblok.com/?token={cfg.management_token}"
-            resp = await client.get(url)
+            # Report connectivity as-is instead of masking failures with retries
+            resp = await client.get(url, extensions={"retry_policy": NO_RETRY})
 
             if 200 <= resp.status_code < 300:
                 return {
@@ -44,3 +47,29 @@ def register_ping(mcp: FastMCP, client: AsyncClient) -> None:
                     }
                 ]
             }
+
+    # Tool: get_request_scheduler_stats
+    @mcp.tool()
+    async def get_request_scheduler_stats() -> dict:
+        """
+        Reports the Management API request scheduler's rate limit, queue depth and wait times.
+        """
+        return scheduler.stats()
+
+    # Tool: get_response_cache_stats
+    @mcp.tool()
+    async def get_response_cache_stats() -> dict:
+        """
+        Reports hits, misses, size and per-resource TTLs of the Management API response cache,
+        plus the on-disk cache of story and component versions under `version_cache`.
+        """
+        return {**response_cache.stats(), "version_cache": version_cache.stats()}
+
+    # Tool: clear_response_cache
+    @mcp.tool()
+    async def clear_response_cache() -> dict:
+        """
+        Drops every cached Management API response so the next reads go to Storyblok.
+        """
+        response_cache.clear()
+        return {"content": [{"type": "text", "text": "Response cache cleared."}]}
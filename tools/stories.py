@@ -1,14 +1,261 @@
+import asyncio
 import json
-from typing import Any, Optional, Dict, List, Union
+from typing import Any, Optional, Dict, List, Literal, Tuple, Union
 from mcp.server.fastmcp import FastMCP
 from httpx import AsyncClient
 from utils.api import (
     build_management_url,
     get_management_headers,
     _handle_response,
+    delivery_cache,
+    paginate,
+    project_fields,
+    run_bounded,
+    summarize_bulk,
     APIError,
 )
-from tools.components import get_component_schema_by_name
+from tools.components import get_component_schema_by_name, schema_registry
+from utils.validation import ContentValidator
+from utils.diff import diff_content, stable_hash
+from utils.graph import topological_levels
+from utils.version_cache import version_cache
+from utils.usage_index import usage_index
+
+def _encode_query_params(options: Dict[str, Any]) -> Dict[str, Any]:
+    """Drops unset options and encodes booleans as 1/0 and dicts as JSON, as the stories endpoint expects."""
+    params: Dict[str, Any] = {}
+    for key, val in options.items():
+        if val is None:
+            continue
+        if isinstance(val, bool):
+            params[key] = 1 if val else 0
+        elif isinstance(val, dict):
+            params[key] = json.dumps(val)
+        else:
+            params[key] = val
+    return params
+
+# Query parameters the Management API honors on GET /stories/{id}. The story
+# endpoint always returns the draft with content, so debug scenarios that only
+# differ in version/with_content receive identical responses.
+MAPI_STORY_PARAMS: frozenset = frozenset()
+
+def _story_version_key(story_id: Any, version_id: Any) -> str:
+    # Keyed by story too, so a version id is only served for the story it belongs to
+    return f"story_version:{story_id}:{version_id}"
+
+def _version_content(version: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns the content tree of a story version, which may hold the whole story or just its content."""
+    content = version.get("content") or {}
+    if isinstance(content, dict) and "component" not in content and isinstance(content.get("content"), dict):
+        return content["content"]
+    return content
+
+def _cache_story_versions(story_id: Any, versions: List[Dict[str, Any]]) -> None:
+    """Stores versions fetched with content; they are immutable, so they never need refetching."""
+    version_cache.put_many({
+        _story_version_key(story_id, v["id"]): v for v in versions if v.get("id") is not None and "content" in v
+    })
+
+async def _list_story_versions(client: AsyncClient, story_id: int, with_content: bool = False) -> List[Dict[str, Any]]:
+    """Lists all versions of a story, oldest first, caching their bodies when content is requested."""
+    params: Dict[str, Any] = {"by_story_id": story_id}
+    if with_content:
+        params["show_content"] = 1
+    versions = [v async for v in paginate(client, "/story_versions", "story_versions", params)]
+    if with_content:
+        _cache_story_versions(story_id, versions)
+    return sorted(versions, key=lambda v: v["id"])
+
+async def _load_version_bodies(client: AsyncClient, story_id: int, version_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    Returns the content of the given versions from the version cache, fetching the
+    story's version history with content in one paginated pass if any is missing.
+    Raises:
+        APIError: If a version does not belong to the story.
+    """
+    bodies: Dict[int, Dict[str, Any]] = {}
+    for version_id in version_ids:
+        cached = version_cache.get(_story_version_key(story_id, version_id))
+        if cached is not None:
+            bodies[version_id] = _version_content(cached)
+    if len(bodies) < len(set(version_ids)):
+        history = {v["id"]: v for v in await _list_story_versions(client, story_id, with_content=True)}
+        for version_id in version_ids:
+            if version_id not in bodies and version_id in history:
+                bodies[version_id] = _version_content(history[version_id])
+    missing = [v for v in version_ids if v not in bodies]
+    if missing:
+        raise APIError(404, "Not Found", f"Versions {missing} not found for story {story_id}",
+                       {"story_id": story_id, "version_ids": missing})
+    return bodies
+
+async def _reindex_story(client: AsyncClient, story_id: Any, data: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Re-indexes a story whose content the API changed on its side (restore, AI translation).
+    Uses the story from the response when it carries content, otherwise fetches it.
+    """
+    if not usage_index.is_built:
+        return
+    story = (data or {}).get("story")
+    if not isinstance(story, dict) or "content" not in story:
+        try:
+            url = build_management_url(f"/stories/{story_id}")
+            resp = await client.get(url, headers=get_management_headers())
+            story = _handle_response(resp, url).get("story", {})
+        except APIError:
+            # The write itself succeeded; the next rebuild picks the change up
+            return
+    usage_index.update_story(story)
+
+async def _current_story_content(client: AsyncClient, story_id: int) -> Dict[str, Any]:
+    url = build_management_url(f"/stories/{story_id}")
+    resp = await client.get(url, headers=get_management_headers())
+    return _handle_response(resp, url).get("story", {}).get("content", {})
+
+# Update arguments that describe the request rather than story state. They are
+# sent along with changed fields but never compared against the stored story.
+UPDATE_CONTEXT_FIELDS = frozenset({"release_id", "lang"})
+
+def _changed_fields(current: Dict[str, Any], fields: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns the update fields whose value differs from the stored story, compared by
+    stable hash. Fields the stored story does not expose always count as changed.
+    """
+    changed = {
+        key: val for key, val in fields.items()
+        if key not in UPDATE_CONTEXT_FIELDS and (key not in current or stable_hash(val) != stable_hash(current[key]))
+    }
+    if changed:
+        changed.update({key: fields[key] for key in UPDATE_CONTEXT_FIELDS if key in fields})
+    return changed
+
+def _needs_publish(current: Dict[str, Any]) -> bool:
+    """True if publishing the stored story would change what is live."""
+    return not current.get("published") or bool(current.get("unpublished_changes"))
+
+async def _fetch_current_stories(client: AsyncClient, story_ids: List[Any]) -> Dict[str, Dict[str, Any]]:
+    """Fetches the stored copies of many stories with content, 100 ids per listing request."""
+    ids = [str(sid) for sid in dict.fromkeys(story_ids) if sid is not None]
+    chunks = [ids[i:i + 100] for i in range(0, len(ids), 100)]
+
+    async def fetch_chunk(chunk: List[str]) -> List[Dict[str, Any]]:
+        params = {"by_ids": ",".join(chunk), "with_content": 1}
+        return [story async for story in paginate(client, "/stories", "stories", params)]
+
+    current: Dict[str, Dict[str, Any]] = {}
+    for stories in await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks)):
+        for story in stories:
+            current[str(story["id"])] = story
+    return current
+
+def _flatten_story_tree(stories: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Flattens nested `children` into a list of nodes in input order. Each node holds the
+    story payload, its slug path within the batch and the index of its parent node,
+    or the `parent_slug` it refers to.
+    """
+    nodes: List[Dict[str, Any]] = []
+    stack: List[Tuple[Dict[str, Any], Optional[int], str]] = [(s, None, "") for s in reversed(stories)]
+    while stack:
+        story_input, parent, parent_path = stack.pop()
+        payload = {k: v for k, v in story_input.items() if k not in ("children", "parent_slug")}
+        parent_slug = (story_input.get("parent_slug") or "").strip("/") or None
+        base = parent_path if parent is not None else (parent_slug or "")
+        path = f"{base}/{payload.get('slug', '')}" if base else str(payload.get("slug", ""))
+        nodes.append({"payload": payload, "path": path, "parent": parent,
+                      "parent_slug": parent_slug if parent is None else None})
+        index = len(nodes) - 1
+        for child in reversed(story_input.get("children") or []):
+            stack.append((child, index, path))
+    return nodes
+
+async def _find_story_ids_by_slug(client: AsyncClient, slugs: List[str]) -> Dict[str, Optional[int]]:
+    """Looks up existing stories by full slug, concurrently."""
+    async def find(slug: str) -> Optional[int]:
+        url = build_management_url("/stories")
+        resp = await client.get(url, headers=get_management_headers(), params={"with_slug": slug})
+        stories = _handle_response(resp, url).get("stories", [])
+        return stories[0]["id"] if stories else None
+
+    ids = await asyncio.gather(*(find(slug) for slug in slugs))
+    return dict(zip(slugs, ids))
+
+def _dependency_entries(data: Any) -> List[Tuple[Optional[Any], Dict[str, Any]]]:
+    """
+    Normalizes an unpublished_dependencies response into (story id, dependency) pairs.
+    Dependencies listed without the story that needs them get None as story id.
+    """
+    items = data
+    if isinstance(data, dict):
+        items = data.get("dependencies") or data.get("unpublished_dependencies") or data.get("stories") or []
+    entries: List[Tuple[Optional[Any], Dict[str, Any]]] = []
+    for item in items if isinstance(items, list) else []:
+        if not isinstance(item, dict):
+            continue
+        nested = item.get("dependencies", item.get("unpublished_dependencies"))
+        if isinstance(nested, list):
+            source = item.get("story_id", item.get("id"))
+            entries.extend((source, dep) for dep in nested if isinstance(dep, dict))
+        else:
+            entries.append((None, item))
+    return entries
+
+def _referenced_uuids(content: Any, known: set) -> set:
+    """
+    Collects the uuids from `known` that a content tree refers to. Story links
+    (multilink `id`, rich text link `uuid`) and single/multi option fields store
+    story uuids as plain strings, so every string value is checked.
+    """
+    found = set()
+    stack = [content]
+    while stack:
+        val = stack.pop()
+        if isinstance(val, dict):
+            stack.extend(val.values())
+        elif isinstance(val, list):
+            stack.extend(val)
+        elif isinstance(val, str) and val in known:
+            found.add(val)
+    return found
+
+# Management API story filters and their Content Delivery API equivalents
+DELIVERY_PARAM_NAMES = {
+    "starts_with": "starts_with",
+    "by_slugs": "by_slugs",
+    "excluding_slugs": "excluding_slugs",
+    "by_uuids": "by_uuids",
+    "by_uuids_ordered": "by_uuids_ordered",
+    "excluding_ids": "excluding_ids",
+    "with_tag": "with_tag",
+    "sort_by": "sort_by",
+    "text_search": "search_term",
+    "in_release": "from_release",
+}
+
+def _delivery_story_params(options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Translate fetch_stories filters into Content Delivery API query parameters.
+    Raises:
+        ValueError: If a filter has no Content Delivery API equivalent.
+    """
+    params: Dict[str, Any] = {}
+    unsupported = []
+    for key, val in options.items():
+        if val is None:
+            continue
+        if key == "filter_query":
+            query = json.loads(val) if isinstance(val, str) else val
+            for field, ops in query.items():
+                for op, operand in ops.items():
+                    params[f"filter_query[{field}][{op}]"] = operand
+        elif key in DELIVERY_PARAM_NAMES:
+            params[DELIVERY_PARAM_NAMES[key]] = val
+        else:
+            unsupported.append(key)
+    if unsupported:
+        raise ValueError(f"Not supported with source='delivery': {', '.join(sorted(unsupported))}")
+    return params
 
 def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
     
@@ -44,17 +291,43 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
         scheduled_at_lt: Optional[str] = None,
         favourite: Optional[bool] = None,
         reference_search: Optional[str] = None,
+        source: Literal["management", "delivery"] = "management",
+        version: Literal["published", "draft"] = "published",
     ) -> Dict[str, Any]:
         """
         Fetch multiple stories from Storyblok with advanced filtering and pagination.
+        With source="delivery" the read goes through the Content Delivery API
+        (public token, far higher rate limits); published results are cached
+        until the space's cache version changes. Draft reads need a preview token.
         """
+        raw_params = dict(locals())
+        if source == "delivery":
+            filters = {
+                k: v for k, v in raw_params.items()
+                if k not in ("mcp", "client", "page", "per_page", "source", "version")
+            }
+            try:
+                params = {"page": page, "per_page": per_page, **_delivery_story_params(filters)}
+                data = await delivery_cache.get(client, "/stories", params, version)
+            except ValueError as e:
+                return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+            except APIError as e:
+                return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+            return {
+                "stories": data.get("stories", []),
+                "total": int(data["total"]) if data.get("total") else len(data.get("stories", [])),
+                "page": page,
+                "per_page": per_page,
+                "source": "delivery",
+                "cv": data.get("cv")
+            }
+
         try:
             url = build_management_url("/stories")
             # Build query parameters
-            raw_params = locals()
             params = {"page": page, "per_page": per_page}
             for key, val in raw_params.items():
-                if key in ["mcp", "client"] or val is None:
+                if key in ["mcp", "client", "source", "version"] or val is None:
                     continue
                 if isinstance(val, bool):
                     params[key] = 1 if val else 0
@@ -74,14 +347,75 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
 
+    @mcp.tool()
+    async def fetch_all_stories(
+        contain_component: Optional[str] = None,
+        text_search: Optional[str] = None,
+        sort_by: Optional[str] = None,
+        with_tag: Optional[str] = None,
+        folder_only: Optional[bool] = None,
+        story_only: Optional[bool] = None,
+        with_parent: Optional[int] = None,
+        starts_with: Optional[str] = None,
+        in_trash: Optional[bool] = None,
+        search: Optional[str] = None,
+        filter_query: Optional[Union[str, Dict[str, Any]]] = None,
+        in_release: Optional[int] = None,
+        is_published: Optional[bool] = None,
+        by_slugs: Optional[str] = None,
+        excluding_slugs: Optional[str] = None,
+        in_workflow_stages: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        max_items: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Fetches every story matching the filters, following all pages.
+        Pages are prefetched concurrently once the total is known. Use `fields`
+        (e.g. ["id", "name", "full_slug"]) to keep responses small.
+        """
+        try:
+            params = _encode_query_params({
+                "contain_component": contain_component,
+                "text_search": text_search,
+                "sort_by": sort_by,
+                "with_tag": with_tag,
+                "folder_only": folder_only,
+                "story_only": story_only,
+                "with_parent": with_parent,
+                "starts_with": starts_with,
+                "in_trash": in_trash,
+                "search": search,
+                "filter_query": filter_query,
+                "in_release": in_release,
+                "is_published": is_published,
+                "by_slugs": by_slugs,
+                "excluding_slugs": excluding_slugs,
+                "in_workflow_stages": in_workflow_stages,
+            })
+            stories = [
+                project_fields(story, fields)
+                async for story in paginate(client, "/stories", "stories", params, max_items=max_items)
+            ]
+            return {"stories": stories, "total": len(stories)}
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
     @mcp.tool()
     async def get_story(
-        story_id: int
+        story_id: int,
+        source: Literal["management", "delivery"] = "management",
+        version: Literal["published", "draft"] = "published"
     ) -> Any:
         """
         Retrieves a specific story by its ID.
+        With source="delivery" the read goes through the Content Delivery API and
+        published results are cached until the space's cache version changes.
         """
         try:
+            if source == "delivery":
+                data = await delivery_cache.get(client, f"/stories/{story_id}", {}, version)
+                data.pop("total", None)
+                return data
             url = build_management_url(f"/stories/{story_id}")
             resp = await client.get(url, headers=get_management_headers())
             return _handle_response(resp, url)
@@ -147,7 +481,9 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
                 headers=get_management_headers(),
                 json=payload
             )
-            return _handle_response(resp, url)
+            data = _handle_response(resp, url)
+            usage_index.update_story(data.get("story", {}))
+            return data
 
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
@@ -175,11 +511,16 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
         force_update: Optional[Union[bool, int]] = None,
         release_id: Optional[int] = None,
         publish: Optional[bool] = False,
-        lang: Optional[str] = None
+        lang: Optional[str] = None,
+        skip_unchanged: bool = False
     ) -> Any:
         """
         Updates an existing Storyblok story by ID.
         Supports all documented fields including publishing.
+        With skip_unchanged, the stored story is fetched first and only fields whose
+        value differs are sent; if nothing differs no new version is created (the story
+        is still published when requested and it has unpublished changes). Ignored
+        when lang is set, as translated values cannot be compared to the stored story.
         """
         try:
             if not name and not slug and not content and not publish:
@@ -210,6 +551,25 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
                 if val is not None:
                     payload_story[key] = val
 
+            if skip_unchanged and not lang:
+                current_url = build_management_url(f"/stories/{story_id}")
+                current_resp = await client.get(current_url, headers=get_management_headers())
+                current = _handle_response(current_resp, current_url).get("story", {})
+                payload_story = _changed_fields(current, payload_story)
+                if not payload_story:
+                    if publish and _needs_publish(current):
+                        publish_url = build_management_url(f"/stories/{story_id}/publish")
+                        publish_params = {"release_id": release_id} if release_id is not None else {}
+                        publish_resp = await client.get(publish_url, headers=get_management_headers(), params=publish_params)
+                        data = _handle_response(publish_resp, publish_url)
+                        data["updated_fields"] = []
+                        return data
+                    return {
+                        "story_id": story_id,
+                        "skipped": True,
+                        "message": "Story already matches the requested fields; nothing was sent.",
+                    }
+
             payload: Dict[str, Any] = {"story": payload_story}
             
             if force_update:
@@ -220,7 +580,11 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
 
             url = build_management_url(f"/stories/{story_id}")
             resp = await client.put(url, headers=get_management_headers(), json=payload)
-            return _handle_response(resp, url)
+            data = _handle_response(resp, url)
+            usage_index.update_story(data.get("story", {}))
+            if skip_unchanged and not lang:
+                data["updated_fields"] = sorted(payload_story)
+            return data
 
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
@@ -232,6 +596,7 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
             url = build_management_url(f"/stories/{id}")
             resp = await client.delete(url, headers=get_management_headers())
             _handle_response(resp, url)
+            usage_index.remove_story(id)
             return {"message": f"Story {id} has been successfully deleted."}
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
@@ -293,8 +658,15 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
     ) -> Any:
         """
         Retrieves versions (revisions) of stories.
+        Versions fetched with content are kept in the local version cache, and a
+        single version_id with show_content is served from it without a request.
         """
         try:
+            if version_id is not None and show_content and by_release_id is None:
+                cached = version_cache.get(_story_version_key(by_story_id, version_id))
+                if cached is not None:
+                    return {"versions": [cached], "page": 1, "per_page": 1, "total": 1}
+
             url = build_management_url("/story_versions")
             params = {
                 "by_story_id": by_story_id,
@@ -310,6 +682,8 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
 
             resp = await client.get(url, headers=get_management_headers(), params=params)
             data = _handle_response(resp, url)
+            if show_content:
+                _cache_story_versions(by_story_id, data.get("story_versions", []))
 
             return {
                 "versions": data.get("story_versions", []),
@@ -322,13 +696,139 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
 
 
+    @mcp.tool()
+    async def fetch_all_story_versions(
+        by_story_id: int,
+        by_release_id: Optional[int] = None,
+        show_content: Optional[bool] = False,
+        fields: Optional[List[str]] = None,
+        max_items: Optional[int] = None
+    ) -> Any:
+        """
+        Retrieves every version (revision) of a story, following all pages.
+        """
+        try:
+            params: Dict[str, Any] = {"by_story_id": by_story_id, "by_release_id": by_release_id}
+            if show_content:
+                params["show_content"] = 1
+            versions = [
+                project_fields(version, fields)
+                async for version in paginate(client, "/story_versions", "story_versions", params, max_items=max_items)
+            ]
+            return {"versions": versions, "total": len(versions)}
+
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
+
+    @mcp.tool()
+    async def diff_story_versions(
+        story_id: int,
+        version_a: int,
+        version_b: Optional[int] = None,
+        context_lines: int = 2
+    ) -> Any:
+        """
+        Computes a structural diff between two versions of a story. Bloks are matched
+        by `_uid` and reported as added, removed, moved (new parent or new order) or
+        changed (per field, with a line diff for rich text and long text).
+        Version bodies are cached, so repeated comparisons cost no API calls.
+        Args:
+            story_id (int): Story ID.
+            version_a (int): Older version ID.
+            version_b (Optional[int]): Newer version ID; defaults to the current draft.
+            context_lines (int): Context lines in text diffs.
+        """
+        try:
+            wanted = [version_a] if version_b is None else [version_a, version_b]
+            bodies = await _load_version_bodies(client, story_id, wanted)
+            if version_b is None:
+                newer = await _current_story_content(client, story_id)
+            else:
+                newer = bodies[version_b]
+            return {
+                "story_id": story_id,
+                "from_version": version_a,
+                "to_version": version_b if version_b is not None else "current",
+                **diff_content(bodies[version_a], newer, context_lines),
+            }
+
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
+
+    @mcp.tool()
+    async def diff_story_version_range(
+        story_id: int,
+        from_version_id: Optional[int] = None,
+        to_version_id: Optional[int] = None,
+        max_versions: int = 50,
+        include_details: bool = False,
+        context_lines: int = 2
+    ) -> Any:
+        """
+        Walks a story's history and diffs each version against the previous one.
+        Returns a summary per step and the net diff from the first to the last
+        version in the range. Version bodies are cached, so walking the same
+        history again costs a single listing request.
+        Args:
+            story_id (int): Story ID.
+            from_version_id (Optional[int]): First version of the range; defaults to the oldest.
+            to_version_id (Optional[int]): Last version of the range; defaults to the newest.
+            max_versions (int): Maximum number of versions to walk (newest are kept); at least 2.
+            include_details (bool): Include the full diff of each step, not just its summary.
+            context_lines (int): Context lines in text diffs.
+        """
+        if max_versions < 2:
+            return {"isError": True, "content": [{"type": "text", "text": "max_versions must be at least 2 to diff a range."}]}
+        try:
+            history = await _list_story_versions(client, story_id)
+            selected = [
+                v for v in history
+                if (from_version_id is None or v["id"] >= from_version_id)
+                and (to_version_id is None or v["id"] <= to_version_id)
+            ][-max_versions:]
+            if len(selected) < 2:
+                return {"story_id": story_id, "versions": len(selected), "steps": [], "net": None}
+
+            bodies = await _load_version_bodies(client, story_id, [v["id"] for v in selected])
+            steps = []
+            for previous, version in zip(selected, selected[1:]):
+                diff = diff_content(bodies[previous["id"]], bodies[version["id"]], context_lines)
+                step = {
+                    "from_version": previous["id"],
+                    "to_version": version["id"],
+                    "created_at": version.get("created_at"),
+                    "author": version.get("author"),
+                    "event": version.get("event"),
+                    "summary": diff["summary"],
+                }
+                if include_details:
+                    step["diff"] = diff
+                steps.append(step)
+
+            return {
+                "story_id": story_id,
+                "versions": len(selected),
+                "from_version": selected[0]["id"],
+                "to_version": selected[-1]["id"],
+                "steps": steps,
+                "net": diff_content(bodies[selected[0]["id"]], bodies[selected[-1]["id"]], context_lines),
+            }
+
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
+
     @mcp.tool()
     async def restore_story(id: str, version_id: str) -> Any:
         """Restores a story to a specific version."""
         try:
             url = build_management_url(f"/stories/{id}/restore/{version_id}")
             resp = await client.post(url, headers=get_management_headers())
-            return _handle_response(resp, url)
+            data = _handle_response(resp, url)
+            await _reindex_story(client, id, data)
+            return data
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
 
@@ -342,9 +842,11 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
         """
         Validates a story's content against a component schema.
         Either provide story_id (to fetch) or story_content directly.
+        Every nested blok is checked against its own component schema: required
+        and unknown fields, field types, max length, options and component whitelists.
         """
         try:
-            schema = await get_component_schema_by_name(component_name, space_id)
+            schema = await get_component_schema_by_name(client, component_name, space_id)
             if not schema:
                 return {"isError": True, "content": [{"type": "text", "text": f"Error: Component schema '{component_name}' not found."}]}
 
@@ -358,16 +860,9 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
             if not content:
                 return {"isError": True, "content": [{"type": "text", "text": "Error: story_id or story_content must be provided and valid."}]}
 
-            errors, missing, extraneous = [], [], []
-            for field, defn in schema.items():
-                if defn.get("required") and content.get(field) is None:
-                    missing.append(field)
-                    errors.append({"field": field, "type": "missing_required", "message": f"Field '{field}' is required."})
-
-            for field in content:
-                if field not in schema:
-                    extraneous.append(field)
-                    errors.append({"field": field, "type": "extraneous_field", "message": f"Field '{field}' not in schema."})
+            errors = ContentValidator(schema_registry.by_name).validate(content, component_name)
+            missing = [e["path"] for e in errors if e["type"] == "missing_required"]
+            extraneous = [e["path"] for e in errors if e["type"] == "extraneous_field"]
 
             return {
                 "isValid": not errors,
@@ -382,8 +877,77 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
 
     @mcp.tool()
-    async def debug_story_access(story_id: str) -> Any:
-        """Debug access to a specific story via various fetch parameters."""
+    async def validate_stories_batch(
+        starts_with: Optional[str] = None,
+        contain_component: Optional[str] = None,
+        details_page: int = 1,
+        details_per_page: int = 25,
+        max_errors_per_story: int = 20,
+        top_components: int = 10
+    ) -> Any:
+        """
+        Validates every story (optionally filtered by starts_with/contain_component)
+        against the component schemas, nested bloks included.
+        Stories are streamed page by page and validated as they arrive. Returns
+        counts by error type, the components with the most errors, and a page of
+        per-story details for invalid stories (see details_page/details_per_page).
+        """
+        try:
+            await schema_registry.ensure_loaded(client)
+            validator = ContentValidator(schema_registry.by_name)
+            params = _encode_query_params({
+                "with_content": 1,
+                "story_only": True,
+                "starts_with": starts_with,
+                "contain_component": contain_component,
+            })
+
+            checked = 0
+            invalid: List[Dict[str, Any]] = []
+            errors_by_type: Dict[str, int] = {}
+            errors_by_component: Dict[str, int] = {}
+            total_errors = 0
+            async for story in paginate(client, "/stories", "stories", params):
+                content = story.get("content")
+                if not content:
+                    continue
+                checked += 1
+                errors = validator.validate(content)
+                if not errors:
+                    continue
+                total_errors += len(errors)
+                for err in errors:
+                    errors_by_type[err["type"]] = errors_by_type.get(err["type"], 0) + 1
+                    errors_by_component[err["component"]] = errors_by_component.get(err["component"], 0) + 1
+                invalid.append({
+                    "id": story.get("id"),
+                    "name": story.get("name"),
+                    "full_slug": story.get("full_slug"),
+                    "error_count": len(errors),
+                    "errors": errors[:max_errors_per_story],
+                })
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
+        start = max(0, (details_page - 1) * details_per_page)
+        return {
+            "stories_checked": checked,
+            "valid_stories": checked - len(invalid),
+            "invalid_stories": len(invalid),
+            "total_errors": total_errors,
+            "errors_by_type": dict(sorted(errors_by_type.items(), key=lambda kv: -kv[1])),
+            "top_offending_components": [
+                {"component": name, "error_count": count}
+                for name, count in sorted(errors_by_component.items(), key=lambda kv: -kv[1])[:top_components]
+            ],
+            "details_page": details_page,
+            "details_per_page": details_per_page,
+            "details_total_pages": -(-len(invalid) // details_per_page) if details_per_page else 0,
+            "details": invalid[start:start + details_per_page],
+        }
+
+    async def _diagnose_story_access(story_id: str) -> Dict[str, Any]:
+        """Runs every access scenario for one story and analyzes the results."""
         api_call_attempts = []
         issues = []
         suggestions = []
@@ -398,8 +962,7 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
             ("Published with content", {"version": "published", "with_content": "1"}),
         ]
 
-        for name, params in scenarios:
-            attempt = {"scenarioName": name, "paramsUsed": {**params, "story_id": story_id}}
+        async def probe(params: Dict[str, Any]) -> Dict[str, Any]:
             try:
                 resp = await client.get(
                     build_management_url(f"/stories/{story_id}"),
@@ -407,41 +970,55 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
                     params=params
                 )
                 data = _handle_response(resp, resp.url)
-                story = data.get("story", {})
-                content_present = bool(story.get("content"))
-                attempt.update({
-                    "status": resp.status_code,
-                    "responseData": {
-                        "id": story.get("id"),
-                        "name": story.get("name"),
-                        "published_at": story.get("published_at"),
-                        "full_slug": story.get("full_slug"),
-                        "content_present": content_present,
-                        "content_component": story.get("content", {}).get("component"),
-                        "version": story.get("version"),
-                    }
-                })
+                return {"status": resp.status_code, "story": data.get("story", {})}
+            except APIError as e:
+                return {"status": e.status_code, "errorDetails": e.details}
 
-                if params.get("version") == "published":
-                    if not pub_details["accessible"] or (content_present and not pub_details["contentPresent"]):
-                        pub_details.update({"accessible": True, "contentPresent": content_present, "fromScenario": name})
-                    if story.get("published_at") is None:
-                        issues.append(f"Scenario '{name}': fetched as published but no published_at.")
-                else:
-                    if not draft_details["accessible"] or (content_present and not draft_details["contentPresent"]):
-                        draft_details.update({"accessible": True, "contentPresent": content_present, "fromScenario": name})
+        # Scenarios that only differ in parameters the Management API ignores share one request
+        fetch_keys = {}
+        for _, params in scenarios:
+            key = tuple(sorted((k, v) for k, v in params.items() if k in MAPI_STORY_PARAMS))
+            fetch_keys.setdefault(key, {k: v for k, v in key})
+        responses = dict(zip(
+            fetch_keys,
+            await asyncio.gather(*(probe(params) for params in fetch_keys.values()))
+        ))
 
-                if params.get("with_content") and not content_present:
-                    issues.append(f"Scenario '{name}': with_content=1 used but no content present.")
-            except APIError as e:
-                parsed = {}
-                try:
-                    parsed = json.loads(str(e))
-                    attempt["status"] = int(parsed.get("error", "").split(" ")[0])
-                    attempt["errorDetails"] = parsed
-                except:
-                    attempt["status"] = "ERROR"
-                    attempt["errorDetails"] = str(e)
+        for name, params in scenarios:
+            attempt = {"scenarioName": name, "paramsUsed": {**params, "story_id": story_id}}
+            key = tuple(sorted((k, v) for k, v in params.items() if k in MAPI_STORY_PARAMS))
+            probe_result = responses[key]
+            attempt["status"] = probe_result["status"]
+            if len(fetch_keys) < len(scenarios):
+                attempt["sharedFetch"] = True
+            if "errorDetails" in probe_result:
+                attempt["errorDetails"] = probe_result["errorDetails"]
+                api_call_attempts.append(attempt)
+                continue
+
+            story = probe_result["story"]
+            content_present = bool(story.get("content"))
+            attempt["responseData"] = {
+                "id": story.get("id"),
+                "name": story.get("name"),
+                "published_at": story.get("published_at"),
+                "full_slug": story.get("full_slug"),
+                "content_present": content_present,
+                "content_component": (story.get("content") or {}).get("component"),
+                "version": story.get("version"),
+            }
+
+            if params.get("version") == "published":
+                if not pub_details["accessible"] or (content_present and not pub_details["contentPresent"]):
+                    pub_details.update({"accessible": True, "contentPresent": content_present, "fromScenario": name})
+                if story.get("published_at") is None:
+                    issues.append(f"Scenario '{name}': fetched as published but no published_at.")
+            else:
+                if not draft_details["accessible"] or (content_present and not draft_details["contentPresent"]):
+                    draft_details.update({"accessible": True, "contentPresent": content_present, "fromScenario": name})
+
+            if params.get("with_content") and not content_present:
+                issues.append(f"Scenario '{name}': with_content=1 used but no content present.")
             api_call_attempts.append(attempt)
 
         # Analyze and generate suggestions
@@ -476,117 +1053,337 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
         }
 
     @mcp.tool()
-    async def bulk_publish_stories(story_ids: List[str]) -> Any:
-        """Publishes multiple stories by ID."""
-        results = []
-        success = fail = 0
-        for sid in story_ids:
+    async def debug_story_access(
+        story_id: Optional[str] = None,
+        story_ids: Optional[List[str]] = None,
+        include_details: bool = False,
+        concurrency: Optional[int] = None
+    ) -> Any:
+        """
+        Debug access to a specific story via various fetch parameters.
+        Pass story_ids instead to diagnose many stories at once; the result then
+        holds a per-story summary (plus full details if include_details is set).
+        """
+        if story_ids:
+            reports = await run_bounded(story_ids, _diagnose_story_access, concurrency)
+            summary = [
+                {
+                    "storyId": r["storyId"],
+                    "accessibleAsDraft": r["accessibleAsDraftDetails"]["accessible"],
+                    "accessibleAsPublished": r["accessibleAsPublishedDetails"]["accessible"],
+                    "statuses": sorted({str(a.get("status")) for a in r["apiCallAttempts"]}),
+                    "issuesDetected": r["issuesDetected"],
+                    "suggestions": r["suggestions"],
+                }
+                for r in reports
+            ]
+            result: Dict[str, Any] = {
+                "storiesDiagnosed": len(reports),
+                "inaccessibleCount": sum(1 for s in summary if not s["accessibleAsDraft"] and not s["accessibleAsPublished"]),
+                "unpublishedCount": sum(1 for s in summary if s["accessibleAsDraft"] and not s["accessibleAsPublished"]),
+                "storiesWithIssues": sum(1 for s in summary if s["issuesDetected"]),
+                "summary": summary,
+            }
+            if include_details:
+                result["details"] = reports
+            return result
+
+        if not story_id:
+            return {"isError": True, "content": [{"type": "text", "text": "Provide story_id or story_ids."}]}
+        return await _diagnose_story_access(story_id)
+
+    @mcp.tool()
+    async def publish_stories_in_order(
+        story_ids: Optional[List[int]] = None,
+        release_id: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        max_failures: Optional[int] = None,
+        dry_run: bool = False
+    ) -> Any:
+        """
+        Publishes a set of stories so that no story goes live before the stories it links to.
+        The set is the given story_ids, or every story in release_id. References between
+        stories of the set (story links, rich text links and options holding story uuids)
+        are read from their content and the stories are published level by level, with up
+        to `concurrency` publishes at once within a level. Stories whose references failed
+        to publish are skipped; stories that reference each other are published together last.
+        With dry_run, only the publish plan is returned.
+        """
+        try:
+            if release_id is not None:
+                params = {"in_release": release_id, "with_content": 1}
+                stories = [story async for story in paginate(client, "/stories", "stories", params)]
+            elif story_ids:
+                current = await _fetch_current_stories(client, story_ids)
+                stories = [current[str(sid)] for sid in dict.fromkeys(story_ids) if str(sid) in current]
+            else:
+                return {"isError": True, "content": [{"type": "text", "text": "Provide story_ids or release_id."}]}
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
+        by_uuid = {story["uuid"]: story["id"] for story in stories if story.get("uuid")}
+        known = set(by_uuid)
+        graph = {
+            story["id"]: {by_uuid[uuid] for uuid in _referenced_uuids(story.get("content") or {}, known)} - {story["id"]}
+            for story in stories
+        }
+        levels, cyclic = topological_levels(graph)
+        if cyclic:
+            levels.append(cyclic)
+        plan = {
+            "levels": levels,
+            "cyclic": cyclic,
+            "dependencies": {str(sid): sorted(deps) for sid, deps in graph.items() if deps},
+        }
+        loaded = {str(story["id"]) for story in stories}
+        missing = [sid for sid in (story_ids or []) if str(sid) not in loaded]
+        if dry_run:
+            return {"dry_run": True, "stories": len(stories), "not_found": missing, "publish_plan": plan}
+
+        results: Dict[Any, Dict[str, Any]] = {}
+        cyclic_set = set(cyclic)
+
+        async def publish(sid: Any) -> Dict[str, Any]:
+            # Within a cycle the members cannot wait for each other
+            blocked = [dep for dep in graph[sid] if results.get(dep, {}).get("status") not in (None, "success")
+                       or (dep not in results and not (sid in cyclic_set and dep in cyclic_set))]
+            if blocked:
+                return {"id": sid, "status": "skipped", "reason": f"Referenced stories {sorted(blocked)} were not published."}
+            try:
+                url = build_management_url(f"/stories/{sid}/publish")
+                params = {"release_id": release_id} if release_id is not None else {}
+                resp = await client.get(url, headers=get_management_headers(), params=params)
+                _handle_response(resp, url)
+                return {"id": sid, "status": "success"}
+            except APIError as e:
+                return {"id": sid, "status": "error", "error": str(e)}
+
+        failures = 0
+        for level in levels:
+            budget = None if max_failures is None else max(max_failures - failures, 0)
+            if budget == 0:
+                level_results = [{"id": sid, "status": "skipped"} for sid in level]
+            else:
+                level_results = await run_bounded(
+                    level, publish, concurrency, budget,
+                    on_skip=lambda sid: {"id": sid, "status": "skipped"}
+                )
+            for sid, result in zip(level, level_results):
+                results[sid] = result
+                failures += result["status"] == "error"
+
+        summary = summarize_bulk([results[story["id"]] for story in stories])
+        summary["not_found"] = missing
+        summary["publish_plan"] = plan
+        return summary
+
+
+    @mcp.tool()
+    async def bulk_publish_stories(
+        story_ids: List[str],
+        concurrency: Optional[int] = None,
+        max_failures: Optional[int] = None
+    ) -> Any:
+        """
+        Publishes multiple stories by ID.
+        Up to `concurrency` requests run at once; once `max_failures` publishes
+        have failed, the remaining stories are skipped.
+        """
+        async def publish(sid: str) -> Dict[str, Any]:
             try:
                 resp = await client.post(
                     build_management_url(f"/stories/{sid}/publish"),
                     headers=get_management_headers()
                 )
                 data = _handle_response(resp, resp.url)
-                results.append({"id": sid, "status": "success", "data": data})
-                success += 1
+                return {"id": sid, "status": "success", "data": data}
             except APIError as e:
-                results.append({"id": sid, "status": "error", "error": str(e)})
-                fail += 1
-        return {"total_processed": len(story_ids), "successful_operations": success,
-                "failed_operations": fail, "results": results}
+                return {"id": sid, "status": "error", "error": str(e)}
+
+        results = await run_bounded(
+            story_ids, publish, concurrency, max_failures,
+            on_skip=lambda sid: {"id": sid, "status": "skipped"}
+        )
+        return summarize_bulk(results)
 
 
     @mcp.tool()
-    async def bulk_delete_stories(story_ids: List[str]) -> Any:
-        """Deletes multiple stories in Storyblok."""
-        results = []
-        success = fail = 0
-        for sid in story_ids:
+    async def bulk_delete_stories(
+        story_ids: List[str],
+        concurrency: Optional[int] = None,
+        max_failures: Optional[int] = None
+    ) -> Any:
+        """
+        Deletes multiple stories in Storyblok.
+        Up to `concurrency` requests run at once; once `max_failures` deletions
+        have failed, the remaining stories are skipped.
+        """
+        async def delete(sid: str) -> Dict[str, Any]:
             try:
                 resp = await client.delete(
                     build_management_url(f"/stories/{sid}"),
                     headers=get_management_headers()
                 )
                 _handle_response(resp, resp.url)
-                results.append({"id": sid, "status": "success"})
-                success += 1
+                usage_index.remove_story(sid)
+                return {"id": sid, "status": "success"}
             except APIError as e:
-                results.append({
+                return {
                     "id": sid,
                     "status": "error",
                     "error": str(e)
-                })
-                fail += 1
-        return {
-            "total_processed": len(story_ids),
-            "successful_operations": success,
-            "failed_operations": fail,
-            "results": results
-        }
+                }
+
+        results = await run_bounded(
+            story_ids, delete, concurrency, max_failures,
+            on_skip=lambda sid: {"id": sid, "status": "skipped"}
+        )
+        return summarize_bulk(results)
 
     @mcp.tool()
     async def bulk_update_stories(
-        stories: List[Dict[str, Any]]
+        stories: List[Dict[str, Any]],
+        skip_unchanged: bool = False,
+        concurrency: Optional[int] = None,
+        max_failures: Optional[int] = None
     ) -> Any:
-        """Updates multiple stories in Storyblok, optionally publishing them."""
-        results = []
-        success = fail = 0
+        """
+        Updates multiple stories in Storyblok, optionally publishing them.
+        Stories with "publish": true are published in the same request as their update.
+        Up to `concurrency` updates run at once; once `max_failures` updates have failed,
+        the remaining stories are skipped. Updates that succeeded but did not publish
+        are listed under publish_failures.
+        With skip_unchanged, the stored stories are fetched in batches of 100 and each
+        update only sends the fields whose value differs; stories that already match
+        are reported as "unchanged" without creating a new version.
+        """
+        current: Dict[str, Dict[str, Any]] = {}
+        if skip_unchanged:
+            try:
+                current = await _fetch_current_stories(client, [s.get("id") for s in stories])
+            except APIError as e:
+                return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
 
-        for story_update in stories:
+        async def update(story_update: Dict[str, Any]) -> Dict[str, Any]:
             sid = story_update.get("id")
-            publish = story_update.pop("publish", False)
-            update_fields = {k: v for k, v in story_update.items() if v is not None}
+            publish = bool(story_update.get("publish"))
+            # The id addresses the story; it is not a field to compare or send
+            update_fields = {k: v for k, v in story_update.items() if v is not None and k not in ("id", "publish")}
+            stored = current.get(str(sid))
+            if stored is not None:
+                update_fields = _changed_fields(stored, update_fields)
+                if not update_fields and not (publish and _needs_publish(stored)):
+                    return {"id": sid, "status": "unchanged"}
+            elif not update_fields and not publish:
+                return {"id": sid, "status": "unchanged"}
+
             try:
-                resp = await client.put(
-                    build_management_url(f"/stories/{sid}"),
-                    headers=get_management_headers(),
-                    json={"story": update_fields}
-                )
-                data = _handle_response(resp, resp.url)
-                published = False
-
-                if publish:
-                    try:
-                        publish_resp = await client.post(
-                            build_management_url(f"/stories/{sid}/publish"),
-                            headers=get_management_headers()
-                        )
-                        _handle_response(publish_resp, publish_resp.url)
-                        published = True
-                    except APIError:
-                        pass  # Publishing errors don't block update success
-
-                results.append({
-                    "id": sid,
-                    "status": "success",
-                    "data": data,
-                    "published": published
-                })
-                success += 1
+                if update_fields:
+                    payload: Dict[str, Any] = {"story": update_fields}
+                    if publish:
+                        payload["publish"] = 1
+                    resp = await client.put(
+                        build_management_url(f"/stories/{sid}"),
+                        headers=get_management_headers(),
+                        json=payload
+                    )
+                    data = _handle_response(resp, resp.url)
+                    usage_index.update_story(data.get("story", {}))
+                else:
+                    # Nothing to update, but the stored story has unpublished changes
+                    release_id = story_update.get("release_id")
+                    resp = await client.get(
+                        build_management_url(f"/stories/{sid}/publish"),
+                        headers=get_management_headers(),
+                        params={"release_id": release_id} if release_id is not None else {}
+                    )
+                    data = _handle_response(resp, resp.url)
             except APIError as e:
-                results.append({
-                    "id": sid,
-                    "status": "error",
-                    "error": str(e)
-                })
-                fail += 1
+                if not update_fields:
+                    return {"id": sid, "status": "success", "published": False,
+                            "publish_error": str(e), "updated_fields": []}
+                return {"id": sid, "status": "error", "error": str(e)}
 
-        return {
-            "total_processed": len(stories),
-            "successful_operations": success,
-            "failed_operations": fail,
-            "results": results
-        }
+            result: Dict[str, Any] = {"id": sid, "status": "success", "data": data}
+            if publish:
+                result["published"] = data.get("story", {}).get("published") is not False
+                if not result["published"]:
+                    result["publish_error"] = "Story was updated but is not published."
+            if stored is not None:
+                result["updated_fields"] = sorted(update_fields)
+            return result
+
+        results = await run_bounded(
+            stories, update, concurrency, max_failures,
+            on_skip=lambda story_update: {"id": story_update.get("id"), "status": "skipped"}
+        )
+        summary = summarize_bulk(results)
+        summary["unchanged_operations"] = sum(1 for r in results if r["status"] == "unchanged")
+        summary["publish_failures"] = [
+            {"id": r["id"], "error": r["publish_error"]} for r in results if "publish_error" in r
+        ]
+        return summary
 
     @mcp.tool()
     async def bulk_create_stories(
-        stories: List[Dict[str, Any]]
+        stories: List[Dict[str, Any]],
+        concurrency: Optional[int] = None,
+        max_failures: Optional[int] = None
     ) -> Any:
-        """Creates multiple stories in Storyblok."""
-        results = []
-        success = fail = 0
+        """
+        Creates multiple stories in Storyblok, including whole folder trees.
+        A story may nest the stories to create inside it under `children`, or name its
+        parent with `parent_slug` (the full slug of a story in the same call or of an
+        existing one). Stories are created level by level: parents first, then their
+        children with `parent_id` filled in from the created parents.
+        Within a level up to `concurrency` requests run at once; once `max_failures`
+        creations have failed, the remaining stories are skipped. Children of a story
+        that was not created are skipped as well.
+        """
+        nodes = _flatten_story_tree(stories)
+        by_path: Dict[str, int] = {}
+        for index, node in enumerate(nodes):
+            by_path.setdefault(node["path"], index)
 
-        for story_input in stories:
+        external: Dict[str, Optional[int]] = {}
+        for node in nodes:
+            if node["parent_slug"] is not None and node["parent_slug"] not in by_path:
+                external[node["parent_slug"]] = None
+        if external:
+            try:
+                external = await _find_story_ids_by_slug(client, list(external))
+            except APIError as e:
+                return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
+        dependencies: Dict[int, List[int]] = {}
+        for index, node in enumerate(nodes):
+            if node["parent_slug"] in by_path:
+                node["parent"] = by_path[node["parent_slug"]]
+            dependencies[index] = [node["parent"]] if node["parent"] is not None else []
+        # A parent's path is a strict prefix of its child's, so parent_slug links can't form a cycle
+        levels, _ = topological_levels(dependencies)
+
+        results: Dict[int, Dict[str, Any]] = {}
+
+        def skipped(index: int, reason: Optional[str] = None) -> Dict[str, Any]:
+            result = {"input": nodes[index]["payload"], "slug": nodes[index]["payload"].get("slug"), "status": "skipped"}
+            if reason:
+                result["reason"] = reason
+            return result
+
+        async def create(index: int) -> Dict[str, Any]:
+            node = nodes[index]
+            story_input = dict(node["payload"])
+            if node["parent"] is not None:
+                parent = results.get(node["parent"], {})
+                if parent.get("status") != "success":
+                    return skipped(index, f"Parent '{nodes[node['parent']]['path']}' was not created.")
+                story_input["parent_id"] = parent["id"]
+            elif node["parent_slug"] is not None:
+                if external.get(node["parent_slug"]) is None:
+                    return {"input": story_input, "slug": story_input.get("slug"), "status": "error",
+                            "error": f"Parent story '{node['parent_slug']}' not found."}
+                story_input["parent_id"] = external[node["parent_slug"]]
             try:
                 resp = await client.post(
                     build_management_url("/stories"),
@@ -594,55 +1391,107 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
                     json={"story": story_input}
                 )
                 data = _handle_response(resp, resp.url)
-                results.append({
+                usage_index.update_story(data.get("story", {}))
+                return {
                     "input": story_input,
                     "id": data.get("story", {}).get("id"),
                     "slug": data.get("story", {}).get("slug"),
                     "status": "success",
                     "data": data
-                })
-                success += 1
+                }
             except APIError as e:
-                results.append({
+                return {
                     "input": story_input,
                     "slug": story_input.get("slug"),
                     "status": "error",
                     "error": str(e)
-                })
-                fail += 1
+                }
 
-        return {
-            "total_processed": len(stories),
-            "successful_operations": success,
-            "failed_operations": fail,
-            "results": results
-        }
+        failures = 0
+        for level in levels:
+            budget = None if max_failures is None else max(max_failures - failures, 0)
+            if budget == 0:
+                level_results = [skipped(index) for index in level]
+            else:
+                level_results = await run_bounded(level, create, concurrency, budget, on_skip=skipped)
+            for index, result in zip(level, level_results):
+                results[index] = result
+                failures += result["status"] == "error"
+
+        summary = summarize_bulk([results[index] for index in range(len(nodes))])
+        summary["levels"] = len(levels)
+        return summary
 
-    
     @mcp.tool()
     async def get_unpublished_dependencies(
         story_ids: List[int],
-        release_id: Optional[int] = None
+        release_id: Optional[int] = None,
+        chunk_size: int = 100,
+        concurrency: Optional[int] = None
     ) -> Any:
         """
         Retrieves unpublished dependencies for one or more stories.
+        Large sets are queried in chunks of `chunk_size` stories, up to `concurrency`
+        chunks at once. The results are merged and deduplicated, and returned with a
+        publish plan: levels of story ids where each level only depends on earlier ones.
         """
-        try:
-            url = build_management_url("/stories/unpublished_dependencies")
-            payload: Dict[str, Any] = {"story_ids": story_ids}
-            if release_id is not None:
-                payload["release_id"] = release_id
+        story_ids = list(dict.fromkeys(story_ids))
+        chunk_size = max(1, chunk_size)
+        chunks = [story_ids[i:i + chunk_size] for i in range(0, len(story_ids), chunk_size)]
 
-            resp = await client.post(
-                url,
-                headers=get_management_headers(),
-                json=payload
-            )
-            return _handle_response(resp, url)
+        async def query(chunk: List[int]) -> Dict[str, Any]:
+            try:
+                url = build_management_url("/stories/unpublished_dependencies")
+                payload: Dict[str, Any] = {"story_ids": chunk}
+                if release_id is not None:
+                    payload["release_id"] = release_id
+                resp = await client.post(url, headers=get_management_headers(), json=payload)
+                return {"story_ids": chunk, "status": "success", "data": _handle_response(resp, url)}
+            except APIError as e:
+                return {"story_ids": chunk, "status": "error", "error": str(e)}
+
+        chunk_results = await run_bounded(chunks, query, concurrency)
+        failed = [r for r in chunk_results if r["status"] == "error"]
+        if failed and len(failed) == len(chunk_results):
+            return {"isError": True, "content": [{"type": "text", "text": failed[0]["error"]}]}
+
+        requested = set(story_ids)
+        dependencies: Dict[Any, Dict[str, Any]] = {}
+        # Stories of failed chunks are left out of the plan and reported under failed_chunks
+        graph: Dict[Any, set] = {}
+        for result in chunk_results:
+            if result["status"] != "success":
+                continue
+            for sid in result["story_ids"]:
+                graph.setdefault(sid, set())
+            unattributed = set()
+            for source, dep in _dependency_entries(result["data"]):
+                dep_id = dep.get("id", dep.get("story_id"))
+                if dep_id is None:
+                    continue
+                dependencies.setdefault(dep_id, dep)
+                graph.setdefault(dep_id, set())
+                if source is None:
+                    unattributed.add(dep_id)
+                else:
+                    graph.setdefault(source, set()).add(dep_id)
+            # Dependencies reported for a whole chunk go before every story in it. Requested
+            # stories listed there can't be ordered among themselves without attribution,
+            # so only dependencies outside the request get an edge.
+            outside = unattributed - requested
+            for sid in result["story_ids"]:
+                graph[sid].update(outside)
+
+        levels, cyclic = topological_levels(graph)
+        return {
+            "stories_checked": len(story_ids),
+            "dependency_count": len(dependencies),
+            "dependencies": list(dependencies.values()),
+            "dependency_graph": {str(sid): sorted(deps, key=str) for sid, deps in graph.items() if deps},
+            "publish_plan": {"levels": levels, "cyclic": cyclic},
+            "failed_chunks": [{"story_ids": r["story_ids"], "error": r["error"]} for r in failed],
+        }
 
-        except APIError as e:
-            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
-        
     @mcp.tool()
     async def ai_translate_story(
         space_id: int,
@@ -670,7 +1519,10 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
                 headers=get_management_headers(),
                 json=payload
             )
-            return _handle_response(resp, url)
+            data = _handle_response(resp, url)
+            # The translation is written into the story's content, so index the stored story
+            await _reindex_story(client, story_id)
+            return data
 
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
@@ -678,12 +1530,23 @@ def register_stories(mcp: FastMCP, client: AsyncClient) -> None:
     @mcp.tool()
     async def compare_story_versions(
         story_id: int,
-        version_v2: int
+        version_v2: int,
+        version_v1: Optional[int] = None
     ) -> Any:
         """
         Compares two versions of a story to identify changes.
+        When version_v1 is given, the versions are diffed locally with a structural
+        blok diff (see diff_story_versions) instead of calling the compare endpoint.
         """
         try:
+            if version_v1 is not None:
+                bodies = await _load_version_bodies(client, story_id, [version_v1, version_v2])
+                return {
+                    "story_id": story_id,
+                    "from_version": version_v1,
+                    "to_version": version_v2,
+                    **diff_content(bodies[version_v1], bodies[version_v2]),
+                }
             url = build_management_url(f"/stories/{story_id}/compare")
             params = {"version_v2": version_v2}
             resp = await client.get(
@@ -1,11 +1,13 @@
 import json
-from typing import Any, Optional, Dict
+from typing import Any, Optional, Dict, List
 from httpx import AsyncClient
 from mcp.server.fastmcp import FastMCP
 from utils.api import (
     build_management_url,
     get_management_headers,
     _handle_response,
+    paginate,
+    project_fields,
     APIError,
 )
 
@@ -32,6 +34,24 @@ def register_tasks(mcp: FastMCP, client: AsyncClient) -> None:
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
     
+    @mcp.tool()
+    async def fetch_all_tasks(
+        fields: Optional[List[str]] = None,
+        max_items: Optional[int] = None
+    ) -> Any:
+        """
+        Retrieves all tasks in the space by following every page of the list endpoint.
+        Use `fields` to keep only selected keys of each item.
+        """
+        try:
+            items = [
+                project_fields(item, fields)
+                async for item in paginate(client, "/tasks/", "tasks", max_items=max_items)
+            ]
+            return {"tasks": items, "total": len(items)}
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
     @mcp.tool()
     async def retrieve_single_task(
         task_id: int
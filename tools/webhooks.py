@@ -6,6 +6,8 @@ from utils.api import (
     build_management_url,
     get_management_headers,
     _handle_response,
+    paginate,
+    project_fields,
     APIError,
 )
 
@@ -31,6 +33,24 @@ def register_webhooks(mcp: FastMCP, client: AsyncClient) -> None:
         except APIError as e:
             return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
         
+    @mcp.tool()
+    async def fetch_all_webhooks(
+        fields: Optional[List[str]] = None,
+        max_items: Optional[int] = None
+    ) -> Any:
+        """
+        Retrieves all webhook endpoints in the space by following every page of the list endpoint.
+        Use `fields` to keep only selected keys of each item.
+        """
+        try:
+            items = [
+                project_fields(item, fields)
+                async for item in paginate(client, "/webhook_endpoints/", "webhook_endpoints", max_items=max_items)
+            ]
+            return {"webhook_endpoints": items, "total": len(items)}
+        except APIError as e:
+            return {"isError": True, "content": [{"type": "text", "text": str(e)}]}
+
     @mcp.tool()
     async def retrieve_single_webhook(
         webhook_endpoint_id: int
@@ -1,10 +1,23 @@
+import asyncio
 import json
-from typing import Any, Dict, Optional
+import math
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Deque, Dict, FrozenSet, List, Optional, Sequence, TypeVar,
+)
+from collections import OrderedDict, deque
+from urllib.parse import urlparse
 import httpx
 from config import API_ENDPOINTS, Config
 
 cfg = Config()
 
+T = TypeVar("T")
+
+MANAGEMENT_HOST = urlparse(API_ENDPOINTS["MANAGEMENT"]).netloc
+
 class APIError(Exception):
     """
     Custom exception for API errors, providing status code, details, and context.
@@ -47,6 +60,10 @@ def _handle_response(response: httpx.Response, endpoint: str) -> Any:
             suggested_fix = "Check token permissions."
         elif response.status_code == 404:
             suggested_fix = "Resource not found. Check endpoint and ID."
+        elif response.status_code == 429:
+            suggested_fix = "Rate limit still exceeded after retries. Lower STORYBLOK_RATE_LIMIT or retry later."
+        elif response.status_code >= 500:
+            suggested_fix = "Storyblok returned a server error after retries. Try again later."
         elif response.status_code == 204:
             suggested_fix = "No content returned. This is not an error, but a valid response for some operations."
 
@@ -80,6 +97,17 @@ def build_management_url(path: str) -> str:
     return f"{API_ENDPOINTS['MANAGEMENT']}/spaces/{cfg.space_id}{path}"
 
 
+def build_delivery_url(path: str) -> str:
+    """
+    Construct a full Content Delivery API URL for a given path.
+    Args:
+        path (str): The API path (e.g., '/stories').
+    Returns:
+        str: Full URL for the Content Delivery API endpoint.
+    """
+    return f"{API_ENDPOINTS['DELIVERY']}{path}"
+
+
 def create_pagination_params(page: int = 1, per_page: int = 25) -> Dict[str, Any]:
     """
     Create pagination parameters for API requests.
@@ -101,3 +129,692 @@ def add_optional_params(params: Dict[str, Any], options: Dict[str, Optional[Any]
     for k, v in options.items():
         if v is not None:
             params[k] = v
+
+
+async def paginate(
+    client: httpx.AsyncClient,
+    path: str,
+    key: str,
+    params: Optional[Dict[str, Any]] = None,
+    per_page: int = 100,
+    prefetch: Optional[int] = None,
+    max_items: Optional[int] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stream every item of a paginated Management API list endpoint.
+    The first page is fetched alone to read the `total` and `per-page` response
+    headers; after that up to `prefetch` pages are requested concurrently while
+    items are yielded in page order. Endpoints without a `total` header are
+    walked sequentially until a short page is returned.
+    Args:
+        client (httpx.AsyncClient): Shared HTTP client.
+        path (str): API path (e.g., '/stories').
+        key (str): Response key holding the list (e.g., 'stories').
+        params (Optional[Dict[str, Any]]): Extra query parameters.
+        per_page (int): Items per page (max 100).
+        prefetch (Optional[int]): Pages in flight at once (defaults to STORYBLOK_BULK_CONCURRENCY).
+        max_items (Optional[int]): Stop after yielding this many items.
+    Yields:
+        Dict[str, Any]: Items in API order.
+    Raises:
+        APIError: If any page request fails.
+    """
+    url = build_management_url(path)
+    base = {k: v for k, v in (params or {}).items() if v is not None}
+    per_page = min(per_page, 100)
+    yielded = 0
+
+    async def fetch(page: int) -> httpx.Response:
+        resp = await client.get(url, headers=get_management_headers(), params={**base, "page": page, "per_page": per_page})
+        _handle_response(resp, url)
+        return resp
+
+    first = await fetch(1)
+    total = first.headers.get("total")
+    page_size = int(first.headers.get("per-page") or per_page)
+    items = first.json().get(key, [])
+    for item in items:
+        if max_items is not None and yielded >= max_items:
+            return
+        yield item
+        yielded += 1
+
+    if total is None:
+        # No total header: walk pages one at a time until a short page
+        page = 1
+        while len(items) >= page_size:
+            page += 1
+            items = (await fetch(page)).json().get(key, [])
+            for item in items:
+                if max_items is not None and yielded >= max_items:
+                    return
+                yield item
+                yielded += 1
+        return
+
+    last_page = math.ceil(int(total) / page_size) if page_size else 1
+    if max_items is not None:
+        last_page = min(last_page, math.ceil(max_items / page_size))
+    window = max(1, prefetch or cfg.bulk_concurrency)
+    pending: Deque[asyncio.Task] = deque()
+    next_page = 2
+    try:
+        while next_page <= last_page or pending:
+            while next_page <= last_page and len(pending) < window:
+                pending.append(asyncio.ensure_future(fetch(next_page)))
+                next_page += 1
+            resp = await pending.popleft()
+            for item in resp.json().get(key, []):
+                if max_items is not None and yielded >= max_items:
+                    return
+                yield item
+                yielded += 1
+    finally:
+        for task in pending:
+            task.cancel()
+
+def project_fields(item: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """
+    Keep only the requested top-level keys of an item.
+    Args:
+        item (Dict[str, Any]): API object.
+        fields (Optional[List[str]]): Keys to keep; None keeps everything.
+    Returns:
+        Dict[str, Any]: The projected item.
+    """
+    if not fields:
+        return item
+    return {k: item[k] for k in fields if k in item}
+
+async def run_bounded(
+    items: Sequence[T],
+    worker: Callable[[T], Awaitable[Dict[str, Any]]],
+    concurrency: Optional[int] = None,
+    max_failures: Optional[int] = None,
+    on_skip: Optional[Callable[[T], Dict[str, Any]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Run worker over items with at most `concurrency` calls in flight.
+    Requests are still paced by the shared scheduler; this only bounds how many
+    are queued at once.
+    Args:
+        items (Sequence[T]): Inputs to process.
+        worker (Callable): Coroutine returning a result dict with a "status" of
+            "success" or "error".
+        concurrency (Optional[int]): In-flight limit (defaults to STORYBLOK_BULK_CONCURRENCY).
+        max_failures (Optional[int]): Stop starting new items once this many have failed.
+        on_skip (Optional[Callable]): Builds the result for items skipped after stopping.
+    Returns:
+        List[Dict[str, Any]]: One result per item, in input order.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency or cfg.bulk_concurrency))
+    failures = 0
+
+    async def run(item: T) -> Dict[str, Any]:
+        nonlocal failures
+        async with semaphore:
+            if max_failures is not None and failures >= max_failures:
+                return on_skip(item) if on_skip else {"status": "skipped"}
+            result = await worker(item)
+            if result.get("status") == "error":
+                failures += 1
+            return result
+
+    return list(await asyncio.gather(*(run(item) for item in items)))
+
+def summarize_bulk(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build the standard bulk tool response from per-item results.
+    Args:
+        results (List[Dict[str, Any]]): Results as returned by run_bounded.
+    Returns:
+        Dict[str, Any]: Totals plus the per-item results.
+    """
+    statuses = [r.get("status") for r in results]
+    return {
+        "total_processed": len(results),
+        "successful_operations": statuses.count("success"),
+        "failed_operations": statuses.count("error"),
+        "skipped_operations": statuses.count("skipped"),
+        "results": results,
+    }
+
+class TokenBucket:
+    """
+    Token bucket pacing requests to a fixed rate.
+    Callers that find the bucket empty wait in FIFO order instead of failing.
+    """
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize TokenBucket.
+        Args:
+            rate (float): Tokens added per second.
+            capacity (float): Maximum number of tokens the bucket can hold.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.waiting = 0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """
+        Drain the bucket so no token is handed out for the given number of seconds.
+        Overlapping pauses extend to the latest deadline instead of adding up.
+        Args:
+            seconds (float): How long to hold back new requests.
+        """
+        self._refill()
+        self.tokens = min(self.tokens, -seconds * self.rate)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> float:
+        """
+        Take one token, sleeping until one is available.
+        Returns:
+            float: Seconds spent waiting for the token.
+        """
+        started = time.monotonic()
+        self.waiting += 1
+        try:
+            async with self._lock:
+                self._refill()
+                # Loop so a pause() that arrives while sleeping is honoured
+                while self.tokens < 1:
+                    await asyncio.sleep((1 - self.tokens) / self.rate)
+                    self._refill()
+                self.tokens -= 1
+        finally:
+            self.waiting -= 1
+        return time.monotonic() - started
+
+class RequestScheduler:
+    """
+    Paces Management API requests with one token bucket per space and keeps
+    queueing statistics for reporting.
+    """
+    def __init__(self, rate: float, burst: float):
+        """
+        Initialize RequestScheduler.
+        Args:
+            rate (float): Requests per second allowed per space.
+            burst (float): Requests allowed back to back before pacing starts.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.total_requests = 0
+        self.delayed_requests = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _bucket(self, key: str) -> TokenBucket:
+        if key not in self.buckets:
+            self.buckets[key] = TokenBucket(self.rate, self.burst)
+        return self.buckets[key]
+
+    async def acquire(self, key: str) -> float:
+        """
+        Wait for a request slot in the bucket identified by key.
+        Args:
+            key (str): Bucket key, usually the space ID.
+        Returns:
+            float: Seconds spent waiting for the slot.
+        """
+        waited = await self._bucket(key).acquire()
+        self.total_requests += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        if waited > 0.001:
+            self.delayed_requests += 1
+        return waited
+
+    def pause(self, key: str, seconds: float) -> None:
+        """
+        Hold back every request to a space, e.g. after the API asked us to slow down.
+        Args:
+            key (str): Bucket key, usually the space ID.
+            seconds (float): How long to hold back new requests.
+        """
+        self._bucket(key).pause(seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report queue depth and wait times.
+        Returns:
+            Dict[str, Any]: Scheduler configuration and counters.
+        """
+        return {
+            "rate_limit_per_second": self.rate,
+            "burst": self.burst,
+            "queue_depth": sum(b.waiting for b in self.buckets.values()),
+            "queue_depth_by_space": {k: b.waiting for k, b in self.buckets.items()},
+            "total_requests": self.total_requests,
+            "delayed_requests": self.delayed_requests,
+            "total_wait_seconds": round(self.total_wait, 3),
+            "average_wait_seconds": round(self.total_wait / self.total_requests, 3) if self.total_requests else 0.0,
+            "max_wait_seconds": round(self.max_wait, 3),
+        }
+
+scheduler = RequestScheduler(cfg.rate_limit, cfg.rate_burst)
+
+def _space_key(url: httpx.URL) -> str:
+    """Return the space ID a Management API URL targets, or 'global' for account-level calls."""
+    parts = url.path.strip("/").split("/")
+    if "spaces" in parts:
+        idx = parts.index("spaces")
+        if idx + 1 < len(parts):
+            return parts[idx + 1]
+    return "global"
+
+class ScheduledTransport(httpx.AsyncBaseTransport):
+    """
+    HTTPX transport that routes every Management API request through the shared
+    RequestScheduler. Requests to other hosts are passed through unchanged.
+    """
+    def __init__(self, transport: httpx.AsyncBaseTransport, request_scheduler: RequestScheduler):
+        self._transport = transport
+        self._scheduler = request_scheduler
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.host == MANAGEMENT_HOST:
+            await self._scheduler.acquire(_space_key(request.url))
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed Management API request is retried.
+
+    Idempotent methods are retried on any retryable status or connection error.
+    Other methods (POST) are only replayed when the request provably did not
+    reach the API: a 429 rejection or a failed connection attempt.
+    """
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        retry_statuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504}),
+        retry_non_idempotent: bool = False,
+    ):
+        """
+        Initialize RetryPolicy.
+        Args:
+            max_retries (int): Maximum number of retries after the first attempt.
+            backoff_base (float): Base delay in seconds, doubled on every attempt.
+            backoff_max (float): Upper bound for a single delay, including Retry-After.
+            retry_statuses (FrozenSet[int]): Status codes considered transient.
+            retry_non_idempotent (bool): Replay POSTs on any retryable status. Only
+                enable this for endpoints that are safe to call twice.
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = retry_statuses
+        self.retry_non_idempotent = retry_non_idempotent
+
+    def _replayable(self, request: httpx.Request) -> bool:
+        return self.retry_non_idempotent or request.method in IDEMPOTENT_METHODS
+
+    def should_retry_response(self, request: httpx.Request, response: httpx.Response, attempt: int) -> bool:
+        """Return True if the response is transient and the request may be sent again."""
+        if attempt >= self.max_retries or response.status_code not in self.retry_statuses:
+            return False
+        return response.status_code == 429 or self._replayable(request)
+
+    def should_retry_error(self, request: httpx.Request, error: httpx.TransportError, attempt: int) -> bool:
+        """Return True if the transport error is transient and the request may be sent again."""
+        if attempt >= self.max_retries:
+            return False
+        # Connection failures mean nothing was sent, so even POSTs are safe to replay
+        return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout)) or self._replayable(request)
+
+    def delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """
+        Seconds to wait before the next attempt.
+        Honors Retry-After when the response carries one, otherwise uses
+        full-jitter exponential backoff.
+        """
+        retry_after = _retry_after_seconds(response) if response is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+NO_RETRY = RetryPolicy(max_retries=0)
+default_retry_policy = RetryPolicy(max_retries=cfg.max_retries, backoff_base=cfg.retry_backoff)
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Parse a Retry-After header given either as seconds or as an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class RetryTransport(httpx.AsyncBaseTransport):
+    """
+    HTTPX transport that retries transient Management API failures.
+    Tools can override the policy per request with
+    ``extensions={"retry_policy": RetryPolicy(...)}``.
+    """
+    def __init__(self, transport: httpx.AsyncBaseTransport, policy: RetryPolicy, request_scheduler: RequestScheduler):
+        self._transport = transport
+        self._policy = policy
+        self._scheduler = request_scheduler
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.host != MANAGEMENT_HOST:
+            return await self._transport.handle_async_request(request)
+
+        policy = request.extensions.get("retry_policy", self._policy)
+        attempt = 0
+        while True:
+            try:
+                response = await self._transport.handle_async_request(request)
+            except httpx.TransportError as e:
+                if not policy.should_retry_error(request, e, attempt):
+                    raise
+                await asyncio.sleep(policy.delay(attempt))
+                attempt += 1
+                continue
+
+            if not policy.should_retry_response(request, response, attempt):
+                return response
+
+            wait = policy.delay(attempt, response)
+            await response.aclose()
+            if response.status_code == 429:
+                # Slow down every queued request for this space, not just this one;
+                # the retry waits on the paused bucket, so it needs no sleep of its own
+                self._scheduler.pause(_space_key(request.url), wait)
+            else:
+                await asyncio.sleep(wait)
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+# Seconds a GET response stays cached, per Management API resource
+CACHE_TTLS: Dict[str, float] = {
+    "components": 300,
+    "component_groups": 300,
+    "datasources": 300,
+    "space_roles": 600,
+    "presets": 300,
+    "workflows": 600,
+    "workflow_stages": 600,
+}
+
+# Writes to the key resource also change what the listed resources return
+CACHE_DEPENDENCIES: Dict[str, tuple] = {
+    "component_groups": ("components",),
+    "versions": ("components",),
+    "workflows": ("workflow_stages",),
+    "workflow_stages": ("workflows",),
+}
+
+def _resource_key(url: httpx.URL) -> tuple:
+    """Return (space ID, resource name) for a Management API URL, e.g. ('123', 'components')."""
+    parts = [p for p in url.path.split("/") if p]
+    if "spaces" in parts:
+        idx = parts.index("spaces")
+        if idx + 2 < len(parts):
+            return parts[idx + 1], parts[idx + 2]
+    return "global", ""
+
+class ResponseCache:
+    """
+    In-process TTL + LRU cache for GET responses, bounded by total body size.
+    Entries are grouped by (space, resource) so writes can invalidate them.
+    """
+    def __init__(self, max_bytes: int):
+        """
+        Initialize ResponseCache.
+        Args:
+            max_bytes (int): Upper bound for the summed size of cached bodies.
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._by_resource: Dict[tuple, set] = {}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a live entry and mark it as recently used, or None."""
+        entry = self._entries.get(key)
+        if entry is None or entry["expires"] <= time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, resource: tuple, ttl: float, status_code: int, headers: list, body: bytes) -> None:
+        """Store a response body, evicting least recently used entries to stay within max_bytes."""
+        if len(body) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = {
+            "expires": time.monotonic() + ttl,
+            "resource": resource,
+            "status_code": status_code,
+            "headers": headers,
+            "body": body,
+        }
+        self._by_resource.setdefault(resource, set()).add(key)
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, space: str, resource: str) -> None:
+        """Drop every entry of a resource, plus resources that depend on it."""
+        for name in (resource,) + CACHE_DEPENDENCIES.get(resource, ()):
+            keys = self._by_resource.pop((space, name), set())
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+        self._by_resource.clear()
+        self.size = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self.size -= len(entry["body"])
+        keys = self._by_resource.get(entry["resource"])
+        if keys is not None:
+            keys.discard(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report cache effectiveness and size.
+        Returns:
+            Dict[str, Any]: Hit/miss counters and current size.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.max_bytes > 0,
+            "entries": len(self._entries),
+            "size_bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "ttls_seconds": CACHE_TTLS,
+        }
+
+response_cache = ResponseCache(cfg.cache_max_bytes)
+
+class DeliveryCache:
+    """
+    Read path through the Content Delivery API using the public token.
+
+    Published responses are cached under the space's `cv` (cache version):
+    requests carry the current cv so the CDN can serve them too, and a cv
+    change makes every older entry unreachable. The cv is re-checked every
+    `cv_check_interval` seconds, or right away after a story write through
+    the Management API. Draft responses are never cached.
+    """
+    def __init__(self, cache: ResponseCache, cv_check_interval: float = 60):
+        """
+        Initialize DeliveryCache.
+        Args:
+            cache (ResponseCache): Storage for published responses.
+            cv_check_interval (float): Seconds between cv checks against the API.
+        """
+        self.cache = cache
+        self.cv_check_interval = cv_check_interval
+        self.cv: Optional[int] = None
+        self.cv_checked_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def mark_stale(self) -> None:
+        """Force a cv check before the next read, e.g. after a publish."""
+        self.cv_checked_at = None
+
+    def _set_cv(self, cv: Any) -> None:
+        if isinstance(cv, int) and cv != self.cv:
+            if self.cv is not None:
+                self.cache.clear()
+            self.cv = cv
+
+    async def current_cv(self, client: httpx.AsyncClient) -> Optional[int]:
+        """
+        Return the space's current cache version, refreshing it when due.
+        Raises:
+            APIError: If the space request fails.
+        """
+        if self.cv_checked_at is not None and time.monotonic() - self.cv_checked_at < self.cv_check_interval:
+            return self.cv
+        async with self._lock:
+            if self.cv_checked_at is None or time.monotonic() - self.cv_checked_at >= self.cv_check_interval:
+                url = build_delivery_url("/spaces/me")
+                resp = await client.get(url, params={"token": cfg.public_token})
+                self._set_cv(_handle_response(resp, url).get("space", {}).get("version"))
+                self.cv_checked_at = time.monotonic()
+        return self.cv
+
+    async def get(self, client: httpx.AsyncClient, path: str, params: Dict[str, Any], version: str = "published") -> Dict[str, Any]:
+        """
+        GET a Content Delivery API path.
+        Args:
+            client (httpx.AsyncClient): Shared HTTP client.
+            path (str): API path (e.g., '/stories').
+            params (Dict[str, Any]): Query parameters, without token/version/cv.
+            version (str): 'published' (cached by cv) or 'draft' (needs a preview token).
+        Returns:
+            Dict[str, Any]: Parsed JSON plus the `total` header when present.
+        Raises:
+            APIError: If the request fails.
+        """
+        url = build_delivery_url(path)
+        query = {**params, "token": cfg.public_token, "version": version}
+        if version == "draft":
+            resp = await client.get(url, params=query)
+            data = _handle_response(resp, url)
+            return {**data, "total": resp.headers.get("total")}
+
+        query["cv"] = await self.current_cv(client)
+        key = str(httpx.URL(url, params=query))
+        entry = self.cache.get(key)
+        if entry is not None:
+            return json.loads(entry["body"])
+
+        resp = await client.get(url, params=query)
+        data = {**_handle_response(resp, url), "total": resp.headers.get("total")}
+        self._set_cv(data.get("cv"))
+        if data.get("cv") == query["cv"]:
+            self.cache.put(key, ("delivery", path), float("inf"), 200, [], json.dumps(data).encode())
+        return data
+
+delivery_cache = DeliveryCache(ResponseCache(cfg.cache_max_bytes))
+
+def _is_story_write(request: httpx.Request) -> bool:
+    """True for Management API calls that can change what the CDN serves."""
+    if _resource_key(request.url)[1] not in ("stories", "releases"):
+        return False
+    return request.method != "GET" or request.url.path.endswith(("/publish", "/unpublish"))
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """
+    HTTPX transport that serves repeated Management API GETs for rarely
+    changing resources from ResponseCache, and invalidates a resource when a
+    write to it succeeds. Cache hits do not consume a rate-limit slot.
+    """
+    def __init__(self, transport: httpx.AsyncBaseTransport, cache: ResponseCache):
+        self._transport = transport
+        self._cache = cache
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.host != MANAGEMENT_HOST:
+            return await self._transport.handle_async_request(request)
+
+        space, resource = _resource_key(request.url)
+        if request.method != "GET" or _is_story_write(request):
+            response = await self._transport.handle_async_request(request)
+            if response.is_success:
+                self._cache.invalidate(space, resource)
+                if _is_story_write(request):
+                    delivery_cache.mark_stale()
+            return response
+
+        ttl = CACHE_TTLS.get(resource)
+        if ttl is None or self._cache.max_bytes <= 0:
+            return await self._transport.handle_async_request(request)
+
+        key = f"{request.headers.get('Authorization', '')} {request.url}"
+        entry = self._cache.get(key)
+        if entry is not None:
+            return httpx.Response(entry["status_code"], headers=entry["headers"], content=entry["body"])
+
+        response = await self._transport.handle_async_request(request)
+        if response.status_code != 200:
+            return response
+        # Keep the raw (still encoded) body so the cached headers stay valid
+        body = b"".join([chunk async for chunk in response.stream])
+        await response.aclose()
+        headers = response.headers.multi_items()
+        self._cache.put(key, (space, resource), ttl, response.status_code, headers, body)
+        return httpx.Response(response.status_code, headers=headers, content=body)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+def create_client() -> httpx.AsyncClient:
+    """
+    Create the shared AsyncClient used by every tool module.
+    Returns:
+        httpx.AsyncClient: Client whose Management API traffic is served from the
+            response cache where possible, paced by the scheduler and retried on
+            transient failures.
+    """
+    transport = ScheduledTransport(httpx.AsyncHTTPTransport(), scheduler)
+    transport = RetryTransport(transport, default_retry_policy, scheduler)
+    return httpx.AsyncClient(transport=CachingTransport(transport, response_cache))
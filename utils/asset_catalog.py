@@ -0,0 +1,390 @@
+import asyncio
+import bisect
+import json
+import os
+import re
+import time
+from contextlib import aclosing
+from typing import Any, Dict, List, Optional, Set, Tuple
+import httpx
+from utils.api import cfg, paginate
+
+# Image dimensions are part of the asset URL: .../f/<space>/<width>x<height>/<hash>/<name>
+DIMENSIONS_PATTERN = re.compile(r"/(\d+)x(\d+)/")
+
+def asset_dimensions(asset: Dict[str, Any]) -> Tuple[Optional[int], Optional[int]]:
+    """Return (width, height) parsed from the asset URL, or (None, None)."""
+    match = DIMENSIONS_PATTERN.search(asset.get("filename") or "")
+    if not match:
+        return None, None
+    return int(match.group(1)), int(match.group(2))
+
+def asset_tags(asset: Dict[str, Any]) -> Set[str]:
+    """Return the lowercased tag names of an asset."""
+    names = {tag.get("name", "") for tag in asset.get("internal_tags_list") or [] if isinstance(tag, dict)}
+    names.update(tag for tag in asset.get("tags") or [] if isinstance(tag, str))
+    return {name.lower() for name in names if name}
+
+# Asset URLs on any Storyblok asset host (including s3.amazonaws.com/a.storyblok.com),
+# captured from the /f/<space>/ path onwards
+ASSET_URL_PATTERN = re.compile(r"storyblok\.com(/f/\d+/[^\s\"'()<>?#]+)")
+
+def asset_path(url: str) -> Optional[str]:
+    """Return the host-independent /f/... path of an asset URL, or None."""
+    match = ASSET_URL_PATTERN.search(url or "")
+    return _strip_modifiers(match.group(1)) if match else None
+
+def _strip_modifiers(path: str) -> str:
+    # Image service URLs append transformations after /m/
+    return path.split("/m/", 1)[0]
+
+def extract_asset_references(content: Any) -> Tuple[Set[int], Set[str]]:
+    """
+    Collect the assets a content tree refers to: asset and multiasset field values,
+    rich text image nodes and asset URLs inside any text.
+    Args:
+        content (Any): Story content.
+    Returns:
+        Tuple[Set[int], Set[str]]: Referenced asset ids and asset URL paths.
+    """
+    ids: Set[int] = set()
+    paths: Set[str] = set()
+    stack = [content]
+    while stack:
+        val = stack.pop()
+        if isinstance(val, dict):
+            if val.get("fieldtype") == "asset" or (val.get("type") == "image" and isinstance(val.get("attrs"), dict)):
+                asset_id = val.get("id") if val.get("fieldtype") == "asset" else val["attrs"].get("id")
+                if isinstance(asset_id, int) or (isinstance(asset_id, str) and asset_id.isdigit()):
+                    ids.add(int(asset_id))
+            stack.extend(val.values())
+        elif isinstance(val, list):
+            stack.extend(val)
+        elif isinstance(val, str) and "storyblok.com/f/" in val:
+            paths.update(_strip_modifiers(match.group(1)) for match in ASSET_URL_PATTERN.finditer(val))
+    return ids, paths
+
+def _short_filename(asset: Dict[str, Any]) -> str:
+    return (asset.get("short_filename") or (asset.get("filename") or "").rsplit("/", 1)[-1]).lower()
+
+class _SortedIndex:
+    """Sorted (value, id) pairs answering range queries with bisect."""
+    def __init__(self):
+        self.keys: List[Tuple[float, int]] = []
+
+    def add(self, value: Optional[float], asset_id: int) -> None:
+        if value is not None:
+            bisect.insort(self.keys, (value, asset_id))
+
+    def remove(self, value: Optional[float], asset_id: int) -> None:
+        if value is None:
+            return
+        i = bisect.bisect_left(self.keys, (value, asset_id))
+        if i < len(self.keys) and self.keys[i] == (value, asset_id):
+            del self.keys[i]
+
+    def between(self, low: Optional[float], high: Optional[float]) -> Set[int]:
+        start = 0 if low is None else bisect.bisect_left(self.keys, (low, -1))
+        end = len(self.keys) if high is None else bisect.bisect_right(self.keys, (high, float("inf")))
+        return {asset_id for _, asset_id in self.keys[start:end]}
+
+class AssetCatalog:
+    """
+    Local copy of the space's asset listing with in-memory indexes for fast lookups.
+
+    The catalog is built by a full crawl and kept fresh by fetching only assets
+    updated since the last sync. Deletions made outside this server only show up
+    after the next full rebuild, which happens once the catalog is older than
+    rebuild_after seconds. Refreshes are serialized; a full rebuild is indexed
+    separately and swapped in when complete, so queries never see a partial catalog.
+    """
+    def __init__(self, path: str, refresh_interval: float = 300, rebuild_after: float = 86400):
+        """
+        Initialize AssetCatalog.
+        Args:
+            path (str): Snapshot file path.
+            refresh_interval (float): Seconds before a query triggers a delta refresh.
+            rebuild_after (float): Seconds before a refresh becomes a full rebuild.
+        """
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.rebuild_after = rebuild_after
+        self.assets: Dict[int, Dict[str, Any]] = {}
+        self.built_at: Optional[float] = None
+        self.synced_at: Optional[float] = None
+        self.last_updated_at: Optional[str] = None
+        self._reset_indexes()
+        self._loaded = False
+        self._lock = asyncio.Lock()
+        self._save_lock = asyncio.Lock()
+        self._dirty = False
+        self._save_task: Optional[asyncio.Task] = None
+
+    def _reset_indexes(self) -> None:
+        self.by_filename: Dict[str, Set[int]] = {}
+        self.by_extension: Dict[str, Set[int]] = {}
+        self.by_folder: Dict[Optional[int], Set[int]] = {}
+        self.by_tag: Dict[str, Set[int]] = {}
+        self.by_width = _SortedIndex()
+        self.by_height = _SortedIndex()
+        self.by_size = _SortedIndex()
+
+    @staticmethod
+    def _keys(asset: Dict[str, Any]) -> Dict[str, Any]:
+        name = _short_filename(asset)
+        width, height = asset_dimensions(asset)
+        return {
+            "filename": name,
+            "extension": os.path.splitext(name)[1].lstrip("."),
+            "folder": asset.get("asset_folder_id") or None,
+            "tags": asset_tags(asset),
+            "width": width,
+            "height": height,
+            "size": asset.get("content_length"),
+        }
+
+    def _index(self, asset: Dict[str, Any]) -> None:
+        asset_id = asset["id"]
+        self._unindex(asset_id)
+        self.assets[asset_id] = asset
+        keys = self._keys(asset)
+        self.by_filename.setdefault(keys["filename"], set()).add(asset_id)
+        self.by_extension.setdefault(keys["extension"], set()).add(asset_id)
+        self.by_folder.setdefault(keys["folder"], set()).add(asset_id)
+        for tag in keys["tags"]:
+            self.by_tag.setdefault(tag, set()).add(asset_id)
+        self.by_width.add(keys["width"], asset_id)
+        self.by_height.add(keys["height"], asset_id)
+        self.by_size.add(keys["size"], asset_id)
+
+    def _unindex(self, asset_id: int) -> None:
+        asset = self.assets.pop(asset_id, None)
+        if asset is None:
+            return
+        keys = self._keys(asset)
+        for index, value in ((self.by_filename, keys["filename"]), (self.by_extension, keys["extension"]),
+                             (self.by_folder, keys["folder"])):
+            ids = index.get(value)
+            if ids is not None:
+                ids.discard(asset_id)
+                if not ids:
+                    del index[value]
+        for tag in keys["tags"]:
+            ids = self.by_tag.get(tag)
+            if ids is not None:
+                ids.discard(asset_id)
+                if not ids:
+                    del self.by_tag[tag]
+        self.by_width.remove(keys["width"], asset_id)
+        self.by_height.remove(keys["height"], asset_id)
+        self.by_size.remove(keys["size"], asset_id)
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.built_at = snapshot.get("built_at")
+        self.synced_at = snapshot.get("synced_at")
+        self.last_updated_at = snapshot.get("last_updated_at")
+        for asset in snapshot.get("assets", []):
+            self._index(asset)
+
+    def _write(self, snapshot: Dict[str, Any]) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp, self.path)
+
+    async def save(self) -> None:
+        """Write the snapshot if it changed, off the event loop; concurrent calls write once."""
+        async with self._save_lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            snapshot = {
+                "built_at": self.built_at,
+                "synced_at": self.synced_at,
+                "last_updated_at": self.last_updated_at,
+                "assets": list(self.assets.values()),
+            }
+            await asyncio.to_thread(self._write, snapshot)
+
+    def _schedule_save(self) -> None:
+        # Writes requested while one is pending are coalesced into it
+        self._dirty = True
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.get_running_loop().create_task(self.save())
+
+    def _adopt(self, other: "AssetCatalog") -> None:
+        self.assets = other.assets
+        self.last_updated_at = other.last_updated_at
+        self.by_filename = other.by_filename
+        self.by_extension = other.by_extension
+        self.by_folder = other.by_folder
+        self.by_tag = other.by_tag
+        self.by_width = other.by_width
+        self.by_height = other.by_height
+        self.by_size = other.by_size
+
+    def _track(self, asset: Dict[str, Any]) -> None:
+        updated = asset.get("updated_at")
+        if updated and (self.last_updated_at is None or updated > self.last_updated_at):
+            self.last_updated_at = updated
+
+    async def refresh(self, client: httpx.AsyncClient, full: bool = False) -> Dict[str, Any]:
+        """
+        Bring the catalog up to date.
+        Args:
+            client (httpx.AsyncClient): Shared client.
+            full (bool): Rebuild from a full crawl instead of fetching changes only.
+        Returns:
+            Dict[str, Any]: Refresh mode and the number of assets fetched.
+        Raises:
+            APIError: If a page request fails.
+        """
+        async with self._lock:
+            return await self._refresh(client, full)
+
+    def _stale(self) -> bool:
+        return self.synced_at is None or time.time() - self.synced_at > self.refresh_interval
+
+    async def _refresh(self, client: httpx.AsyncClient, full: bool) -> Dict[str, Any]:
+        self._load()
+        now = time.time()
+        full = full or self.built_at is None or now - self.built_at > self.rebuild_after
+        fetched = 0
+        if full:
+            staged = AssetCatalog(self.path)
+            staged._loaded = True
+            async for asset in paginate(client, "/assets", "assets", {}):
+                staged._index(asset)
+                staged._track(asset)
+                fetched += 1
+            self._adopt(staged)
+            self.built_at = now
+        else:
+            # Newest first, stopping at the first asset the catalog already has
+            since = self.last_updated_at
+            pages = paginate(client, "/assets", "assets", {"sort_by": "updated_at:desc"}, prefetch=1)
+            async with aclosing(pages):
+                async for asset in pages:
+                    if since is not None and (asset.get("updated_at") or "") < since:
+                        break
+                    self._index(asset)
+                    self._track(asset)
+                    fetched += 1
+        self.synced_at = now
+        self._dirty = True
+        await self.save()
+        return {"mode": "full" if full else "delta", "fetched": fetched, "assets": len(self.assets)}
+
+    async def ensure_fresh(self, client: httpx.AsyncClient) -> None:
+        """Refresh if the last sync is older than refresh_interval."""
+        self._load()
+        if not self._stale():
+            return
+        async with self._lock:
+            # Another caller may have refreshed while we waited for the lock
+            if self._stale():
+                await self._refresh(client, False)
+
+    def add(self, asset: Dict[str, Any]) -> None:
+        """Index an asset created by this server; the snapshot is written in the background."""
+        self._load()
+        if asset.get("id") is not None:
+            self._index(asset)
+            self._schedule_save()
+
+    def remove(self, asset_ids: List[Any]) -> None:
+        """Drop deleted assets; the snapshot is written in the background."""
+        self._load()
+        changed = False
+        for asset_id in asset_ids:
+            try:
+                asset_id = int(asset_id)
+            except (TypeError, ValueError):
+                continue
+            if asset_id in self.assets:
+                self._unindex(asset_id)
+                changed = True
+        if changed:
+            self._schedule_save()
+
+    def query(
+        self,
+        filename: Optional[str] = None,
+        extensions: Optional[List[str]] = None,
+        folder_id: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+        text: Optional[str] = None,
+        min_width: Optional[int] = None,
+        max_width: Optional[int] = None,
+        min_height: Optional[int] = None,
+        max_height: Optional[int] = None,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find assets matching every given filter.
+        Args:
+            filename (Optional[str]): Case-insensitive substring of the file name.
+            extensions (Optional[List[str]]): File extensions, e.g. ["jpg", "png"].
+            folder_id (Optional[int]): Asset folder id; 0 for the top level.
+            tags (Optional[List[str]]): Tag names the asset must all have.
+            text (Optional[str]): Case-insensitive substring of alt, title or copyright.
+            min_width, max_width, min_height, max_height (Optional[int]): Pixel bounds.
+            min_size, max_size (Optional[int]): Byte bounds.
+        Returns:
+            List[Dict[str, Any]]: Matching assets, newest first.
+        """
+        self._load()
+        candidates: Optional[Set[int]] = None
+
+        def narrow(ids: Set[int]) -> None:
+            nonlocal candidates
+            candidates = set(ids) if candidates is None else candidates & ids
+
+        if folder_id is not None:
+            narrow(self.by_folder.get(folder_id or None, set()))
+        if extensions:
+            narrow(set().union(*(self.by_extension.get(e.lower().lstrip("."), set()) for e in extensions)))
+        for tag in tags or []:
+            narrow(self.by_tag.get(tag.lower(), set()))
+        for index, low, high in ((self.by_width, min_width, max_width), (self.by_height, min_height, max_height),
+                                 (self.by_size, min_size, max_size)):
+            if low is not None or high is not None:
+                narrow(index.between(low, high))
+        if filename:
+            needle = filename.lower()
+            names = [ids for name, ids in self.by_filename.items() if needle in name]
+            narrow(set().union(*names) if names else set())
+
+        ids = set(self.assets) if candidates is None else candidates
+        results = [self.assets[i] for i in ids]
+        if text:
+            needle = text.lower()
+            results = [
+                asset for asset in results
+                if any(needle in str(asset.get(field) or (asset.get("meta_data") or {}).get(field) or "").lower()
+                       for field in ("alt", "title", "copyright"))
+            ]
+        results.sort(key=lambda asset: asset.get("updated_at") or "", reverse=True)
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        """Report catalog size and sync times."""
+        self._load()
+        return {
+            "assets": len(self.assets),
+            "built_at": self.built_at,
+            "synced_at": self.synced_at,
+            "total_bytes": sum(asset.get("content_length") or 0 for asset in self.assets.values()),
+        }
+
+asset_catalog = AssetCatalog(os.path.join(cfg.cache_dir, f"asset_catalog_{cfg.space_id}.json"))
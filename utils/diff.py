@@ -0,0 +1,181 @@
+import difflib
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.validation import BLOK_META_KEYS
+
+# Rich text nodes that end a line when flattened to plain text
+RICHTEXT_BLOCK_NODES = frozenset({
+    "paragraph", "heading", "blockquote", "code_block", "list_item", "horizontal_rule",
+})
+
+# Strings longer than this (or spanning several lines) are reported as a line diff
+TEXT_DIFF_THRESHOLD = 200
+
+def stable_hash(value: Any) -> str:
+    """Hash a JSON value independently of dict key order."""
+    raw = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def is_blok_list(value: Any) -> bool:
+    """Return True if a field value is a list of bloks."""
+    return isinstance(value, list) and bool(value) and all(
+        isinstance(item, dict) and "component" in item for item in value
+    )
+
+def is_richtext(value: Any) -> bool:
+    """Return True if a field value is a rich text document."""
+    return isinstance(value, dict) and value.get("type") == "doc"
+
+def richtext_to_text(node: Any) -> str:
+    """Flatten a rich text node to plain text, one line per block node."""
+    if not isinstance(node, dict):
+        return ""
+    kind = node.get("type")
+    if kind == "text":
+        return node.get("text", "")
+    if kind == "hard_break":
+        return "\n"
+    text = "".join(richtext_to_text(child) for child in node.get("content") or [])
+    if kind in RICHTEXT_BLOCK_NODES:
+        return text + "\n"
+    return text
+
+def text_diff(old: str, new: str, context: int = 2) -> List[str]:
+    """Return the unified line diff between two texts, without file headers."""
+    lines = difflib.unified_diff(old.splitlines(), new.splitlines(), lineterm="", n=context)
+    return [line for line in lines if not line.startswith(("---", "+++"))]
+
+def index_bloks(content: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Index every blok of a content tree by its `_uid`.
+    Args:
+        content (Dict[str, Any]): Root blok of the story content.
+    Returns:
+        Dict[str, Dict[str, Any]]: uid -> component, path, parent uid, parent field,
+            position and the blok itself. Bloks without a `_uid` are keyed by path.
+    """
+    index: Dict[str, Dict[str, Any]] = {}
+    stack: List[Tuple[Dict[str, Any], str, Optional[str], Optional[str], int]] = [(content, "", None, None, 0)]
+    while stack:
+        blok, path, parent, field, position = stack.pop()
+        uid = blok.get("_uid") or f"path:{path}"
+        index[uid] = {
+            "component": blok.get("component"),
+            "path": path,
+            "parent": parent,
+            "field": field,
+            "position": position,
+            "blok": blok,
+        }
+        for name, value in blok.items():
+            if is_blok_list(value):
+                base = f"{path}.{name}" if path else name
+                for i, child in enumerate(value):
+                    stack.append((child, f"{base}.{i}", uid, name, i))
+    return index
+
+def diff_fields(old: Dict[str, Any], new: Dict[str, Any], context: int = 2) -> List[Dict[str, Any]]:
+    """
+    Compare the non-blok fields of two versions of the same blok.
+    Args:
+        old (Dict[str, Any]): Blok before the change.
+        new (Dict[str, Any]): Blok after the change.
+        context (int): Context lines for text diffs.
+    Returns:
+        List[Dict[str, Any]]: One entry per changed field, with old/new values or a text_diff.
+    """
+    changes: List[Dict[str, Any]] = []
+    for field in sorted(set(old) | set(new)):
+        if field in BLOK_META_KEYS:
+            continue
+        before, after = old.get(field), new.get(field)
+        if is_blok_list(before) or is_blok_list(after):
+            # Child bloks are diffed individually
+            if (before in (None, []) or is_blok_list(before)) and (after in (None, []) or is_blok_list(after)):
+                continue
+        if before == after:
+            continue
+        if is_richtext(before) and is_richtext(after):
+            changes.append({"field": field, "kind": "richtext",
+                            "text_diff": text_diff(richtext_to_text(before), richtext_to_text(after), context)})
+        elif isinstance(before, str) and isinstance(after, str) and (
+            "\n" in before or "\n" in after or max(len(before), len(after)) > TEXT_DIFF_THRESHOLD
+        ):
+            changes.append({"field": field, "kind": "text", "text_diff": text_diff(before, after, context)})
+        else:
+            changes.append({"field": field, "kind": "value", "old": before, "new": after})
+    return changes
+
+def _reordered(old_index: Dict[str, Dict[str, Any]], new_index: Dict[str, Dict[str, Any]], common: set) -> set:
+    """Return uids that changed position within an unchanged parent list."""
+    containers: Dict[Tuple[Optional[str], Optional[str]], Tuple[List[str], List[str]]] = {}
+    for uid in common:
+        old, new = old_index[uid], new_index[uid]
+        if (old["parent"], old["field"]) == (new["parent"], new["field"]) and old["parent"] is not None:
+            pair = containers.setdefault((old["parent"], old["field"]), ([], []))
+            pair[0].append(uid)
+            pair[1].append(uid)
+    moved = set()
+    for old_seq, new_seq in containers.values():
+        old_seq.sort(key=lambda uid: old_index[uid]["position"])
+        new_seq.sort(key=lambda uid: new_index[uid]["position"])
+        if old_seq == new_seq:
+            continue
+        matcher = difflib.SequenceMatcher(a=old_seq, b=new_seq, autojunk=False)
+        kept = {uid for block in matcher.get_matching_blocks() for uid in old_seq[block.a:block.a + block.size]}
+        moved.update(uid for uid in old_seq if uid not in kept)
+    return moved
+
+def diff_content(old: Dict[str, Any], new: Dict[str, Any], context: int = 2) -> Dict[str, Any]:
+    """
+    Compute a structural diff between two content trees, matching bloks by `_uid`.
+    Args:
+        old (Dict[str, Any]): Content before the change.
+        new (Dict[str, Any]): Content after the change.
+        context (int): Context lines for text diffs.
+    Returns:
+        Dict[str, Any]: summary counts plus added, removed, moved and changed bloks.
+            A blok is moved when it changed parent or its order among its siblings.
+    """
+    old_index, new_index = index_bloks(old or {}), index_bloks(new or {})
+    common = set(old_index) & set(new_index)
+    reordered = _reordered(old_index, new_index, common)
+
+    added = [
+        {"uid": uid, "component": entry["component"], "path": entry["path"]}
+        for uid, entry in new_index.items() if uid not in old_index
+    ]
+    removed = [
+        {"uid": uid, "component": entry["component"], "path": entry["path"]}
+        for uid, entry in old_index.items() if uid not in new_index
+    ]
+    moved: List[Dict[str, Any]] = []
+    changed: List[Dict[str, Any]] = []
+    for uid in common:
+        before, after = old_index[uid], new_index[uid]
+        if uid in reordered or (before["parent"], before["field"]) != (after["parent"], after["field"]):
+            moved.append({"uid": uid, "component": after["component"], "from": before["path"], "to": after["path"]})
+        fields = diff_fields(before["blok"], after["blok"], context)
+        if before["component"] != after["component"]:
+            fields.insert(0, {"field": "component", "kind": "value",
+                              "old": before["component"], "new": after["component"]})
+        if fields:
+            changed.append({"uid": uid, "component": after["component"], "path": after["path"], "fields": fields})
+
+    for entries in (added, removed, changed):
+        entries.sort(key=lambda e: e["path"])
+    moved.sort(key=lambda e: e["to"])
+    return {
+        "summary": {
+            "added": len(added),
+            "removed": len(removed),
+            "moved": len(moved),
+            "changed": len(changed),
+        },
+        "added": added,
+        "removed": removed,
+        "moved": moved,
+        "changed": changed,
+    }
@@ -0,0 +1,38 @@
+from typing import Dict, Hashable, Iterable, List, Tuple, TypeVar
+
+Node = TypeVar("Node", bound=Hashable)
+
+def topological_levels(dependencies: Dict[Node, Iterable[Node]]) -> Tuple[List[List[Node]], List[Node]]:
+    """
+    Group a dependency graph into levels that can each be processed concurrently.
+    Every node comes after all of its dependencies; dependencies that are not keys
+    of the graph are treated as already satisfied.
+    Args:
+        dependencies (Dict[Node, Iterable[Node]]): Node -> nodes it depends on.
+    Returns:
+        Tuple[List[List[Node]], List[Node]]: The levels in order, and the nodes left
+            over because they are part of (or depend on) a cycle.
+    """
+    pending: Dict[Node, int] = {}
+    dependents: Dict[Node, List[Node]] = {node: [] for node in dependencies}
+    for node, deps in dependencies.items():
+        inside = {dep for dep in deps if dep in dependents and dep != node}
+        pending[node] = len(inside)
+        for dep in inside:
+            dependents[dep].append(node)
+    # A self-reference is a dependency that can never be satisfied
+    stuck = {node for node, deps in dependencies.items() if node in set(deps)}
+
+    levels: List[List[Node]] = []
+    current = [node for node, count in pending.items() if count == 0 and node not in stuck]
+    while current:
+        levels.append(current)
+        following = []
+        for node in current:
+            for dependent in dependents[node]:
+                pending[dependent] -= 1
+                if pending[dependent] == 0 and dependent not in stuck:
+                    following.append(dependent)
+        current = following
+    placed = {node for level in levels for node in level}
+    return levels, [node for node in dependencies if node not in placed]
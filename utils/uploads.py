@@ -0,0 +1,209 @@
+import hashlib
+import json
+import mimetypes
+import os
+from typing import Any, BinaryIO, Dict, Iterable, Optional
+import httpx
+from utils.api import (
+    cfg,
+    build_management_url,
+    get_management_headers,
+    _handle_response,
+    APIError,
+)
+
+# Uploads stream for as long as the file takes; only connecting and waiting for S3 are bounded
+UPLOAD_TIMEOUT = httpx.Timeout(60.0, write=None)
+
+class HashingReader:
+    """
+    Read-only file wrapper that hashes everything read through it.
+
+    fileno/tell/seek are delegated so httpx can size the multipart body from the
+    underlying file and stream it in chunks. Seeking back to the start resets the
+    digests, so a rewound and re-sent body is hashed once.
+    """
+    def __init__(self, fileobj: BinaryIO, algorithms: Iterable[str] = ("md5",)):
+        """
+        Initialize HashingReader.
+        Args:
+            fileobj (BinaryIO): File opened in binary mode.
+            algorithms (Iterable[str]): hashlib algorithm names to compute.
+        """
+        self._file = fileobj
+        self._algorithms = tuple(algorithms)
+        self._hashes = {name: hashlib.new(name) for name in self._algorithms}
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._file.read(size)
+        for digest in self._hashes.values():
+            digest.update(data)
+        return data
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        position = self._file.seek(offset, whence)
+        if position == 0:
+            self._hashes = {name: hashlib.new(name) for name in self._algorithms}
+        return position
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def fileno(self) -> int:
+        return self._file.fileno()
+
+    def hexdigest(self, algorithm: str = "md5") -> str:
+        """Return the digest of the bytes read since the last rewind."""
+        return self._hashes[algorithm].hexdigest()
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Return the SHA-256 of a file, reading it in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+async def upload_file(
+    client: httpx.AsyncClient,
+    path: str,
+    asset_folder_id: Optional[int] = None,
+    filename: Optional[str] = None,
+    content_type: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Upload a local file as a new asset: sign the upload, stream the file to S3 and
+    finish the upload, verifying the MD5 checksum against the ETag S3 returns.
+    If the transfer fails or the checksum does not match, the unfinished asset is deleted.
+    Args:
+        client (httpx.AsyncClient): Shared client.
+        path (str): Local file path.
+        asset_folder_id (Optional[int]): Folder to place the asset in.
+        filename (Optional[str]): Asset filename; defaults to the file's name.
+        content_type (Optional[str]): MIME type; guessed from the filename by default.
+    Returns:
+        Dict[str, Any]: The finished asset plus md5, sha256, size and checksum status.
+    Raises:
+        APIError: If signing, uploading or finishing fails, or the checksum does not match.
+        OSError: If the file cannot be read.
+    """
+    filename = filename or os.path.basename(path)
+    content_type = content_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    size = os.path.getsize(path)
+
+    url = build_management_url("/assets")
+    payload: Dict[str, Any] = {"filename": filename, "size": size, "content_type": content_type}
+    if asset_folder_id is not None:
+        payload["asset_folder_id"] = asset_folder_id
+    resp = await client.post(url, json=payload, headers=get_management_headers())
+    signed = _handle_response(resp, url)
+    asset_id = signed.get("id")
+
+    try:
+        with open(path, "rb") as f:
+            reader = HashingReader(f, ("md5", "sha256"))
+            # S3 expects the file as the last form field; no Storyblok headers go to S3
+            s3_resp = await client.post(
+                signed["post_url"],
+                data=signed.get("fields", {}),
+                files={"file": (filename, reader, content_type)},
+                timeout=UPLOAD_TIMEOUT,
+            )
+        if s3_resp.status_code >= 300:
+            raise APIError(s3_resp.status_code, s3_resp.reason_phrase, s3_resp.text[:500],
+                           {"url": signed["post_url"], "asset_id": asset_id})
+
+        md5 = reader.hexdigest("md5")
+        etag = s3_resp.headers.get("etag", "").strip('"')
+        # Only single-part uploads have an MD5 ETag; multipart ETags contain a dash
+        if etag and "-" not in etag:
+            if etag != md5:
+                raise APIError(422, "Checksum Mismatch", f"S3 ETag {etag} does not match the file's MD5 {md5}",
+                               {"url": signed["post_url"], "asset_id": asset_id})
+            checksum = "verified"
+        else:
+            checksum = "unverified"
+
+        finish_url = build_management_url(f"/assets/{asset_id}/finish_upload")
+        finish_resp = await client.post(finish_url, headers=get_management_headers())
+        asset = _handle_response(finish_resp, finish_url)
+    except (APIError, OSError, httpx.HTTPError):
+        if asset_id is not None:
+            await _discard_asset(client, asset_id)
+        raise
+
+    return {
+        "asset": asset,
+        "id": asset_id,
+        "filename": filename,
+        "size": size,
+        "md5": md5,
+        "sha256": reader.hexdigest("sha256"),
+        "checksum": checksum,
+    }
+
+async def _discard_asset(client: httpx.AsyncClient, asset_id: Any) -> None:
+    try:
+        url = build_management_url(f"/assets/{asset_id}")
+        await client.delete(url, headers=get_management_headers())
+    except httpx.HTTPError:
+        pass
+
+class UploadManifest:
+    """
+    Local record of uploaded files by SHA-256, used to recognize files that were
+    already uploaded to a folder. Storyblok does not expose content hashes, so the
+    manifest only knows uploads made from this machine.
+    """
+    def __init__(self, path: str, save_every: int = 100):
+        """
+        Initialize UploadManifest.
+        Args:
+            path (str): JSON file the manifest is persisted to.
+            save_every (int): Records between saves; save() writes the rest.
+        """
+        self.path = path
+        self.save_every = save_every
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._unsaved = 0
+        self._loaded = False
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    @staticmethod
+    def _key(sha256: str, asset_folder_id: Optional[int]) -> str:
+        return f"{asset_folder_id or 0}:{sha256}"
+
+    def lookup(self, sha256: str, asset_folder_id: Optional[int]) -> Optional[Dict[str, Any]]:
+        """Return the recorded upload of this content to this folder, if any."""
+        self._load()
+        return self.entries.get(self._key(sha256, asset_folder_id))
+
+    def record(self, sha256: str, asset_folder_id: Optional[int], asset_id: Any, filename: str) -> None:
+        """Remember an upload, saving every save_every records."""
+        self._load()
+        self.entries[self._key(sha256, asset_folder_id)] = {"id": asset_id, "filename": filename}
+        self._unsaved += 1
+        if self._unsaved >= self.save_every:
+            self.save()
+
+    def save(self) -> None:
+        """Write the manifest to disk."""
+        if not self._loaded:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f)
+        os.replace(tmp, self.path)
+        self._unsaved = 0
+
+upload_manifest = UploadManifest(os.path.join(cfg.cache_dir, f"upload_manifest_{cfg.space_id}.json"))
@@ -0,0 +1,194 @@
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+import httpx
+from utils.api import cfg, paginate
+
+def extract_component_paths(content: Any) -> Dict[str, List[str]]:
+    """
+    Collect the field path of every blok in a content tree, grouped by component name.
+    Args:
+        content (Any): Story content (root blok).
+    Returns:
+        Dict[str, List[str]]: Component name -> paths such as 'body.0.columns.1'.
+    """
+    found: Dict[str, List[str]] = {}
+    stack = [(content, "")]
+    while stack:
+        val, path = stack.pop()
+        if isinstance(val, dict):
+            name = val.get("component")
+            if isinstance(name, str):
+                found.setdefault(name, []).append(path or "<root>")
+            for key, child in val.items():
+                if isinstance(child, (dict, list)):
+                    stack.append((child, f"{path}.{key}" if path else key))
+        elif isinstance(val, list):
+            for i, child in enumerate(val):
+                if isinstance(child, (dict, list)):
+                    stack.append((child, f"{path}.{i}" if path else str(i)))
+    for paths in found.values():
+        paths.sort()
+    return found
+
+class ComponentUsageIndex:
+    """
+    Inverted index of component name -> stories using it, with field paths and counts.
+
+    The per-story entries are persisted as a JSON snapshot plus an append-only
+    journal of incremental changes, so single story writes do not rewrite the
+    whole file. The journal is folded into the snapshot once it grows large.
+    """
+    def __init__(self, path: str, compact_after: int = 500):
+        """
+        Initialize ComponentUsageIndex.
+        Args:
+            path (str): Snapshot file path; the journal lives next to it.
+            compact_after (int): Journal entries before a new snapshot is written.
+        """
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.compact_after = compact_after
+        self.stories: Dict[str, Dict[str, Any]] = {}
+        self.components: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.built_at: Optional[float] = None
+        self._journal_entries = 0
+        self._loaded = False
+
+    @property
+    def is_built(self) -> bool:
+        """True once the index has been built (now or in an earlier session)."""
+        self._load()
+        return self.built_at is not None
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.built_at = snapshot.get("built_at")
+        for story_id, entry in snapshot.get("stories", {}).items():
+            self._set(story_id, entry)
+        try:
+            with open(self.journal_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        change = json.loads(line)
+                    except ValueError:
+                        continue  # torn write from an interrupted session
+                    self._apply(change)
+                    self._journal_entries += 1
+        except OSError:
+            pass
+
+    def _set(self, story_id: str, entry: Optional[Dict[str, Any]]) -> None:
+        old = self.stories.pop(story_id, None)
+        if old is not None:
+            for name in old["components"]:
+                stories = self.components.get(name)
+                if stories is not None:
+                    stories.pop(story_id, None)
+                    if not stories:
+                        del self.components[name]
+        if entry is None:
+            return
+        self.stories[story_id] = entry
+        for name, paths in entry["components"].items():
+            self.components.setdefault(name, {})[story_id] = {"count": len(paths), "paths": paths}
+
+    def _apply(self, change: Dict[str, Any]) -> None:
+        self._set(str(change["id"]), change.get("entry"))
+
+    @staticmethod
+    def _entry(story: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "name": story.get("name"),
+            "full_slug": story.get("full_slug"),
+            "components": extract_component_paths(story.get("content") or {}),
+        }
+
+    def _write_snapshot(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"built_at": self.built_at, "stories": self.stories}, f)
+        os.replace(tmp, self.path)
+        try:
+            os.remove(self.journal_path)
+        except OSError:
+            pass
+        self._journal_entries = 0
+
+    def _record(self, change: Dict[str, Any]) -> None:
+        self._apply(change)
+        if self._journal_entries + 1 >= self.compact_after:
+            self._write_snapshot()
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(change) + "\n")
+        self._journal_entries += 1
+
+    async def build(self, client: httpx.AsyncClient) -> None:
+        """
+        Rebuild the index from a full crawl of the space's stories.
+        Raises:
+            APIError: If any page request fails.
+        """
+        self._loaded = True
+        self.stories, self.components = {}, {}
+        async for story in paginate(client, "/stories", "stories", {"with_content": 1, "story_only": 1}):
+            self._set(str(story["id"]), self._entry(story))
+        self.built_at = time.time()
+        self._write_snapshot()
+
+    def update_story(self, story: Dict[str, Any]) -> None:
+        """Re-index one story from a create/update response. No-op until the index is built."""
+        if not self.is_built or story.get("id") is None or "content" not in story:
+            return
+        self._record({"id": str(story["id"]), "entry": self._entry(story)})
+
+    def remove_story(self, story_id: Any) -> None:
+        """Drop a deleted story. No-op until the index is built."""
+        if not self.is_built or str(story_id) not in self.stories:
+            return
+        self._record({"id": str(story_id), "entry": None})
+
+    def query(self, component_names: List[str], include_paths: bool = True) -> Dict[str, Any]:
+        """
+        Look up where each component is used.
+        Args:
+            component_names (List[str]): Components to look up.
+            include_paths (bool): Include the field paths of every occurrence.
+        Returns:
+            Dict[str, Any]: Per-component usage plus index metadata.
+        """
+        self._load()
+        results = {}
+        for name in component_names:
+            usage = self.components.get(name, {})
+            stories = []
+            for story_id, hit in usage.items():
+                story = self.stories[story_id]
+                item = {"id": int(story_id) if story_id.isdigit() else story_id,
+                        "name": story.get("name"), "full_slug": story.get("full_slug"), "count": hit["count"]}
+                if include_paths:
+                    item["paths"] = hit["paths"]
+                stories.append(item)
+            results[name] = {
+                "usage_count": len(stories),
+                "total_occurrences": sum(s["count"] for s in stories),
+                "used_in_stories": stories,
+            }
+        return {
+            "index_built_at": self.built_at,
+            "stories_indexed": len(self.stories),
+            "components": results,
+        }
+
+usage_index = ComponentUsageIndex(os.path.join(cfg.cache_dir, f"usage_index_{cfg.space_id}.json"))
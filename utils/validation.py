@@ -0,0 +1,220 @@
+import hashlib
+import json
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+# Keys Storyblok adds to every blok that are not part of a component schema
+BLOK_META_KEYS = frozenset({"component", "_uid", "_editable"})
+
+# Schema entries that only structure the editor UI and never hold content
+LAYOUT_FIELD_TYPES = frozenset({"section", "tab"})
+
+def _is_number(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, (int, float)):
+        return True
+    if isinstance(value, str):
+        if value == "":
+            return True
+        try:
+            float(value)
+            return True
+        except ValueError:
+            return False
+    return False
+
+# Field type -> (check, expected type description). Unknown types are not type-checked.
+TYPE_CHECKS: Dict[str, Tuple[Callable[[Any], bool], str]] = {
+    "text": (lambda v: isinstance(v, str), "string"),
+    "textarea": (lambda v: isinstance(v, str), "string"),
+    "markdown": (lambda v: isinstance(v, str), "string"),
+    "datetime": (lambda v: isinstance(v, str), "string"),
+    "number": (_is_number, "number"),
+    "boolean": (lambda v: isinstance(v, bool), "boolean"),
+    "option": (lambda v: isinstance(v, (str, int)), "string"),
+    "options": (lambda v: isinstance(v, list), "list"),
+    "richtext": (lambda v: isinstance(v, (dict, str)), "richtext document"),
+    "asset": (lambda v: isinstance(v, dict), "asset object"),
+    "multiasset": (lambda v: isinstance(v, list), "list of assets"),
+    "multilink": (lambda v: isinstance(v, dict), "link object"),
+    "bloks": (lambda v: isinstance(v, list), "list of bloks"),
+    "table": (lambda v: isinstance(v, dict), "table object"),
+}
+
+class FieldRule:
+    """Pre-computed checks for one schema field."""
+    __slots__ = ("name", "type", "required", "check", "expected", "max_length",
+                 "options", "whitelist", "minimum", "maximum")
+
+    def __init__(self, name: str, definition: Dict[str, Any]):
+        self.name = name
+        self.type = definition.get("type")
+        self.required = bool(definition.get("required"))
+        self.check, self.expected = TYPE_CHECKS.get(self.type, (None, None))
+        max_length = definition.get("max_length", definition.get("maxlength"))
+        self.max_length = int(max_length) if str(max_length or "").isdigit() else None
+        # Datasource-backed options cannot be checked without fetching the datasource
+        self.options: Optional[FrozenSet[str]] = None
+        if self.type in ("option", "options") and definition.get("source") in (None, "", "self"):
+            values = [str(o.get("value")) for o in definition.get("options") or [] if isinstance(o, dict)]
+            if values:
+                self.options = frozenset(values)
+        self.whitelist: Optional[FrozenSet[str]] = None
+        if self.type == "bloks" and definition.get("restrict_components") and definition.get("component_whitelist"):
+            self.whitelist = frozenset(definition["component_whitelist"])
+        self.minimum = _to_number(definition.get("minimum"))
+        self.maximum = _to_number(definition.get("maximum"))
+
+def _to_number(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+class ValidationPlan:
+    """A component schema compiled into field rules for repeated validation."""
+    __slots__ = ("component", "fields", "required")
+
+    def __init__(self, component: str, schema: Dict[str, Any]):
+        self.component = component
+        self.fields: Dict[str, FieldRule] = {
+            name: FieldRule(name, definition)
+            for name, definition in (schema or {}).items()
+            if isinstance(definition, dict) and definition.get("type") not in LAYOUT_FIELD_TYPES
+        }
+        self.required = tuple(name for name, rule in self.fields.items() if rule.required)
+
+_plan_cache: Dict[Tuple[str, str], ValidationPlan] = {}
+
+def schema_version(component: Dict[str, Any]) -> str:
+    """Return a version key for a component: its updated_at, or a hash of its schema."""
+    if component.get("updated_at"):
+        return str(component["updated_at"])
+    return hashlib.sha1(json.dumps(component.get("schema") or {}, sort_keys=True).encode()).hexdigest()
+
+def compile_plan(component: Dict[str, Any]) -> ValidationPlan:
+    """
+    Compile a component schema, reusing the cached plan for the same schema version.
+    Args:
+        component (Dict[str, Any]): Component as returned by the Management API.
+    Returns:
+        ValidationPlan: The compiled plan.
+    """
+    key = (component.get("name", ""), schema_version(component))
+    plan = _plan_cache.get(key)
+    if plan is None:
+        plan = ValidationPlan(key[0], component.get("schema") or {})
+        _plan_cache[key] = plan
+    return plan
+
+def _error(path: str, component: str, field: str, kind: str, message: str) -> Dict[str, Any]:
+    return {
+        "path": f"{path}.{field}" if path else field,
+        "component": component,
+        "field": field,
+        "type": kind,
+        "message": message,
+    }
+
+class ContentValidator:
+    """
+    Validates story content trees against component schemas, including every
+    nested blok. Plans are compiled once per schema version and shared between
+    validator instances.
+    """
+    def __init__(self, components: Dict[str, Dict[str, Any]]):
+        """
+        Initialize ContentValidator.
+        Args:
+            components (Dict[str, Dict[str, Any]]): Components indexed by name.
+        """
+        self.components = components
+        self._plans: Dict[str, ValidationPlan] = {}
+
+    def plan(self, name: str) -> Optional[ValidationPlan]:
+        """Return the compiled plan for a component name, or None if it is unknown."""
+        plan = self._plans.get(name)
+        if plan is None:
+            component = self.components.get(name)
+            if component is None:
+                return None
+            plan = self._plans[name] = compile_plan(component)
+        return plan
+
+    def validate(self, content: Dict[str, Any], root_component: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Validate a content tree.
+        Args:
+            content (Dict[str, Any]): Root blok of the story content.
+            root_component (Optional[str]): Component to validate the root against;
+                defaults to the root blok's own `component`.
+        Returns:
+            List[Dict[str, Any]]: Errors with path, component, field, type and message.
+        """
+        errors: List[Dict[str, Any]] = []
+        root_name = root_component or content.get("component")
+        if root_component and content.get("component") not in (None, root_component):
+            errors.append(_error("", root_component, "component", "component_mismatch",
+                                 f"Content is a '{content.get('component')}' blok, expected '{root_component}'."))
+
+        stack: List[Tuple[Dict[str, Any], str, Optional[str]]] = [(content, "", root_name)]
+        while stack:
+            blok, path, name = stack.pop()
+            plan = self.plan(name) if name else None
+            if plan is None:
+                errors.append(_error(path, name or "", "component", "unknown_component",
+                                     f"Component '{name}' has no schema in this space."))
+                continue
+            fields = plan.fields
+
+            for field in plan.required:
+                value = blok.get(field)
+                if value is None or value == "" or value == []:
+                    errors.append(_error(path, name, field, "missing_required", f"Field '{field}' is required."))
+
+            for field, value in blok.items():
+                rule = fields.get(field)
+                if rule is None:
+                    if field in BLOK_META_KEYS or field.split("__i18n__")[0] in fields:
+                        continue
+                    errors.append(_error(path, name, field, "extraneous_field", f"Field '{field}' not in schema."))
+                    continue
+                if value is None or value == "":
+                    continue
+                if rule.check is not None and not rule.check(value):
+                    errors.append(_error(path, name, field, "invalid_type",
+                                         f"Field '{field}' must be a {rule.expected}."))
+                    continue
+                if rule.max_length is not None and isinstance(value, str) and len(value) > rule.max_length:
+                    errors.append(_error(path, name, field, "max_length_exceeded",
+                                         f"Field '{field}' is {len(value)} characters long; the maximum is {rule.max_length}."))
+                if rule.options is not None:
+                    chosen = value if isinstance(value, list) else [value]
+                    invalid = [v for v in chosen if str(v) not in rule.options]
+                    if invalid:
+                        errors.append(_error(path, name, field, "invalid_option",
+                                             f"Field '{field}' has values not in its options: {invalid}."))
+                if rule.type == "number" and (rule.minimum is not None or rule.maximum is not None):
+                    number = float(value)
+                    if (rule.minimum is not None and number < rule.minimum) or (rule.maximum is not None and number > rule.maximum):
+                        errors.append(_error(path, name, field, "out_of_range",
+                                             f"Field '{field}' must be between {rule.minimum} and {rule.maximum}."))
+                if rule.type == "bloks":
+                    if rule.maximum is not None and len(value) > rule.maximum:
+                        errors.append(_error(path, name, field, "too_many_bloks",
+                                             f"Field '{field}' holds {len(value)} bloks; the maximum is {int(rule.maximum)}."))
+                    if rule.minimum is not None and len(value) < rule.minimum:
+                        errors.append(_error(path, name, field, "too_few_bloks",
+                                             f"Field '{field}' holds {len(value)} bloks; the minimum is {int(rule.minimum)}."))
+                    child_base = f"{path}.{field}" if path else field
+                    for i, child in enumerate(value):
+                        child_path = f"{child_base}.{i}"
+                        if not isinstance(child, dict) or not child.get("component"):
+                            errors.append(_error(child_base, name, str(i), "invalid_blok",
+                                                 f"Item {i} of '{field}' is not a blok."))
+                            continue
+                        if rule.whitelist is not None and child["component"] not in rule.whitelist:
+                            errors.append(_error(child_base, name, str(i), "component_not_allowed",
+                                                 f"Component '{child['component']}' is not allowed in '{field}'."))
+                        stack.append((child, child_path, child["component"]))
+        return errors
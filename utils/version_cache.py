@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from utils.api import cfg
+
+class VersionCache:
+    """
+    Disk-backed cache for immutable objects such as story and component versions.
+
+    Objects are stored zlib-compressed under the SHA-256 of their canonical JSON,
+    so identical bodies are kept once however many keys point at them. Entries
+    never expire; once the compressed objects exceed max_bytes the least recently
+    used ones are evicted. Recently read objects are also kept decoded in memory.
+    """
+    def __init__(self, directory: str, max_bytes: int, memory_items: int = 128):
+        """
+        Initialize VersionCache.
+        Args:
+            directory (str): Directory holding the objects and the key index.
+            max_bytes (int): Upper bound for the summed size of compressed objects (0 disables the cache).
+            memory_items (int): Decoded objects kept in memory.
+        """
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.json")
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._keys: Dict[str, str] = {}
+        self._objects: Dict[str, Dict[str, Any]] = {}
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._loaded = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @property
+    def size(self) -> int:
+        return sum(obj["size"] for obj in self._objects.values())
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return
+        self._keys = index.get("keys", {})
+        self._objects = index.get("objects", {})
+
+    def _save(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"keys": self._keys, "objects": self._objects}, f)
+        os.replace(tmp, self.index_path)
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "objects", digest[:2], digest + ".z")
+
+    def _remember(self, digest: str, value: Any) -> None:
+        self._memory[digest] = value
+        self._memory.move_to_end(digest)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached object for a key, or None."""
+        if not self.enabled:
+            return None
+        self._load()
+        digest = self._keys.get(key)
+        if digest is None or digest not in self._objects:
+            self.misses += 1
+            return None
+        self._objects[digest]["atime"] = time.time()
+        if digest in self._memory:
+            self._memory.move_to_end(digest)
+            self.hits += 1
+            return self._memory[digest]
+        try:
+            with open(self._object_path(digest), "rb") as f:
+                value = json.loads(zlib.decompress(f.read()))
+        except (OSError, ValueError, zlib.error):
+            # Missing or corrupt object: forget it and refetch
+            self._drop({digest})
+            self.misses += 1
+            return None
+        self._remember(digest, value)
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store one object under a key."""
+        self.put_many({key: value})
+
+    def put_many(self, items: Dict[str, Any]) -> None:
+        """
+        Store several objects, then evict and persist the index once.
+        Args:
+            items (Dict[str, Any]): Key -> JSON-serializable object.
+        """
+        if not self.enabled or not items:
+            return
+        self._load()
+        now = time.time()
+        for key, value in items.items():
+            raw = json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")
+            digest = hashlib.sha256(raw).hexdigest()
+            if digest not in self._objects:
+                data = zlib.compress(raw, 6)
+                if len(data) > self.max_bytes:
+                    continue
+                path = self._object_path(digest)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path + ".tmp", "wb") as f:
+                    f.write(data)
+                os.replace(path + ".tmp", path)
+                self._objects[digest] = {"size": len(data), "atime": now}
+            else:
+                self._objects[digest]["atime"] = now
+            self._keys[key] = digest
+            self._remember(digest, value)
+        self._evict()
+        self._save()
+
+    def _evict(self) -> None:
+        total = self.size
+        if total <= self.max_bytes:
+            return
+        dropped = set()
+        for digest in sorted(self._objects, key=lambda d: self._objects[d]["atime"]):
+            if total <= self.max_bytes:
+                break
+            total -= self._objects[digest]["size"]
+            dropped.add(digest)
+        self._drop(dropped)
+        self.evictions += len(dropped)
+
+    def _drop(self, digests: set) -> None:
+        for digest in digests:
+            self._objects.pop(digest, None)
+            self._memory.pop(digest, None)
+            try:
+                os.remove(self._object_path(digest))
+            except OSError:
+                pass
+        self._keys = {k: d for k, d in self._keys.items() if d not in digests}
+
+    def clear(self) -> None:
+        """Drop every cached object from memory and disk."""
+        self._load()
+        self._drop(set(self._objects))
+        self._keys.clear()
+        if os.path.isdir(self.directory):
+            self._save()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report cache effectiveness and size.
+        Returns:
+            Dict[str, Any]: Hit/miss counters and current size.
+        """
+        self._load()
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "directory": self.directory,
+            "keys": len(self._keys),
+            "objects": len(self._objects),
+            "size_bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+version_cache = VersionCache(os.path.join(cfg.cache_dir, f"versions_{cfg.space_id}"), cfg.version_cache_max_bytes)